@@ -0,0 +1,199 @@
+from array import array
+from itertools import repeat
+
+from complex_numbers import Complex
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def _buffer(values):
+    if numpy is not None:
+        return numpy.array(values, dtype=numpy.float64)
+    return array('d', values)
+
+
+def _parts(no):
+    # scalars are broadcast to every element
+    if isinstance(no, (ComplexArray, Complex)):
+        return no.real, no.imaginary
+    return NotImplemented
+
+
+def _check_divisor(real, imaginary):
+    # zero divisors raise ZeroDivisionError on both backends, like the
+    # float division of the pure Python one, instead of giving inf and nan
+    if numpy is not None and numpy.any((numpy.asarray(real) == 0) &
+                                       (numpy.asarray(imaginary) == 0)):
+        raise ZeroDivisionError('complex division by zero')
+
+
+def _each(values, size):
+    if isinstance(values, (int, float)):
+        return repeat(values, size)
+    return values
+
+
+class ComplexArray(object):
+    """Complex numbers stored as two contiguous float buffers, real and
+    imaginary parts, with elementwise arithmetic. NumPy arrays are used when
+    NumPy is installed, otherwise array('d')."""
+
+    __slots__ = ('real', 'imaginary')
+
+    def __init__(self, real, imaginary=None):
+        self.real = _buffer(real)
+        if imaginary is None:
+            imaginary = [0.0] * len(self.real)
+        self.imaginary = _buffer(imaginary)
+        if len(self.real) != len(self.imaginary):
+            raise ValueError('real and imaginary parts differ in length')
+
+    @classmethod
+    def from_complexes(cls, numbers):
+        numbers = list(numbers)
+        return cls([no.real for no in numbers],
+                   [no.imaginary for no in numbers])
+
+    def __len__(self):
+        return len(self.real)
+
+    def __getitem__(self, i):
+        return Complex(float(self.real[i]), float(self.imaginary[i]))
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def _check_length(self, no):
+        if isinstance(no, ComplexArray) and len(no) != len(self):
+            raise ValueError('operands differ in length: %d and %d'
+                             % (len(self), len(no)))
+
+    def _apply(self, no, operation):
+        parts = _parts(no)
+        if parts is NotImplemented:
+            return NotImplemented
+        self._check_length(no)
+        a, b = self.real, self.imaginary
+        c, d = parts
+        if numpy is not None:
+            return ComplexArray(*operation(a, b, c, d))
+        size = len(self)
+        real, imaginary = [], []
+        for x, y, u, v in zip(a, b, _each(c, size), _each(d, size)):
+            new_real, new_imaginary = operation(x, y, u, v)
+            real.append(new_real)
+            imaginary.append(new_imaginary)
+        return ComplexArray(real, imaginary)
+
+    def __add__(self, no):
+        return self._apply(no, lambda a, b, c, d: (a + c, b + d))
+    __radd__ = __add__
+
+    def __sub__(self, no):
+        return self._apply(no, lambda a, b, c, d: (a - c, b - d))
+
+    def __rsub__(self, no):
+        return self._apply(no, lambda a, b, c, d: (c - a, d - b))
+
+    def __mul__(self, no):
+        return self._apply(no, lambda a, b, c, d: (a*c - b*d, a*d + b*c))
+    __rmul__ = __mul__
+
+    def __truediv__(self, no):
+        def divide(a, b, c, d):
+            _check_divisor(c, d)
+            denominator = c**2 + d**2
+            return (a*c + b*d) / denominator, (c*b - a*d) / denominator
+        return self._apply(no, divide)
+    __div__ = __truediv__
+
+    def __rtruediv__(self, no):
+        def divide(a, b, c, d):
+            _check_divisor(a, b)
+            denominator = a**2 + b**2
+            return (c*a + d*b) / denominator, (a*d - c*b) / denominator
+        return self._apply(no, divide)
+    __rdiv__ = __rtruediv__
+
+    def _apply_inplace(self, no, operation, fallback):
+        parts = _parts(no)
+        if parts is NotImplemented:
+            return NotImplemented
+        self._check_length(no)
+        if numpy is None:
+            result = fallback(no)
+            self.real, self.imaginary = result.real, result.imaginary
+        else:
+            c, d = parts
+            # the operations write into self, so no must not be read from it
+            if (numpy.may_share_memory(c, self.real) or
+                    numpy.may_share_memory(d, self.imaginary) or
+                    numpy.may_share_memory(c, self.imaginary) or
+                    numpy.may_share_memory(d, self.real)):
+                c, d = numpy.copy(c), numpy.copy(d)
+            operation(c, d)
+        return self
+
+    def __iadd__(self, no):
+        def add(c, d):
+            numpy.add(self.real, c, out=self.real)
+            numpy.add(self.imaginary, d, out=self.imaginary)
+        return self._apply_inplace(no, add, self.__add__)
+
+    def __isub__(self, no):
+        def subtract(c, d):
+            numpy.subtract(self.real, c, out=self.real)
+            numpy.subtract(self.imaginary, d, out=self.imaginary)
+        return self._apply_inplace(no, subtract, self.__sub__)
+
+    def __imul__(self, no):
+        def multiply(c, d):
+            a, b = self.real, self.imaginary
+            real = a * c
+            real -= b * d
+            b *= c
+            a *= d
+            b += a
+            a[:] = real
+        return self._apply_inplace(no, multiply, self.__mul__)
+
+    def __itruediv__(self, no):
+        def divide(c, d):
+            _check_divisor(c, d)
+            a, b = self.real, self.imaginary
+            denominator = numpy.square(c) + numpy.square(d)
+            real = a * c
+            real += b * d
+            b *= c
+            a *= d
+            b -= a
+            b /= denominator
+            real /= denominator
+            a[:] = real
+        return self._apply_inplace(no, divide, self.__truediv__)
+    __idiv__ = __itruediv__
+
+    def mod(self):
+        if numpy is not None:
+            return ComplexArray(numpy.hypot(self.real, self.imaginary))
+        return ComplexArray([pow(a**2 + b**2, 0.5)
+                             for a, b in zip(self.real, self.imaginary)])
+
+    def to_strings(self):
+        # same text as Complex.__str__ for every element
+        if numpy is None:
+            return [str(no) for no in self]
+        real, imaginary = self.real, self.imaginary
+        real_str = numpy.where((real == 0) & (imaginary != 0), '0.00',
+                               numpy.char.mod('%.2f', real))
+        sign = numpy.where(imaginary < 0, '-', '+')
+        imaginary_str = numpy.char.mod('%.2fi', numpy.abs(imaginary))
+        return numpy.char.add(numpy.char.add(real_str, sign),
+                              imaginary_str).tolist()
+
+    def __str__(self):
+        return '\n'.join(self.to_strings())
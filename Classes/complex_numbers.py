@@ -1,21 +1,33 @@
 import math
 
 class Complex(object):
+    __slots__ = ('real', 'imaginary')
+
     def __init__(self, real, imaginary):
         self.real = real
         self.imaginary = imaginary
     def __add__(self, no):
+        if not isinstance(no, Complex):
+            return NotImplemented
         return Complex(self.real + no.real, self.imaginary + no.imaginary)
     def __sub__(self, no):
+        if not isinstance(no, Complex):
+            return NotImplemented
         return Complex(self.real - no.real, self.imaginary - no.imaginary)
     def __mul__(self, no):
+        if not isinstance(no, Complex):
+            return NotImplemented
         return Complex(self.real*no.real - self.imaginary*no.imaginary, 
                        self.real*no.imaginary + no.real*self.imaginary)
     def __div__(self, no):
+        if not isinstance(no, Complex):
+            return NotImplemented
+        denominator = no.real**2 + no.imaginary**2
         return Complex((self.real*no.real+self.imaginary*no.imaginary)/
-                       (no.real**2 + no.imaginary**2),
+                       denominator,
                        (no.real*self.imaginary - self.real*no.imaginary)/
-                       (no.real**2 + no.imaginary**2))
+                       denominator)
+    __truediv__ = __div__
     def mod(self):
         return Complex(pow (self.real**2 + self.imaginary**2, 0.5), 0)
     def __str__(self):
@@ -37,4 +49,4 @@ if __name__ == '__main__':
     d = map(float, raw_input().split())
     x = Complex(*c)
     y = Complex(*d)
-    print '\n'.join(map(str, [x+y, x-y, x*y, x/y, x.mod(), y.mod()]))
\ No newline at end of file
+    print('\n'.join(map(str, [x+y, x-y, x*y, x/y, x.mod(), y.mod()])))
\ No newline at end of file
@@ -0,0 +1,64 @@
+import unittest
+
+import complex_array
+from complex_array import ComplexArray
+from complex_numbers import Complex
+
+
+class ComplexArrayTest(unittest.TestCase):
+    # every test runs with the backend of the module, NumPy if installed,
+    # and with the pure Python one
+
+    def run_both(self, check):
+        numpy = complex_array.numpy
+        try:
+            check()
+            complex_array.numpy = None
+            check()
+        finally:
+            complex_array.numpy = numpy
+
+    def test_length_mismatch(self):
+        def check():
+            x = ComplexArray([1., 2., 3.], [0., 0., 0.])
+            y = ComplexArray([1., 2.], [0., 0.])
+            for operation in (lambda: x + y, lambda: x - y, lambda: x * y,
+                              lambda: x / y, lambda: y + x):
+                self.assertRaises(ValueError, operation)
+            z = ComplexArray([1.], [1.])
+            self.assertRaises(ValueError, lambda: x * z)
+
+            def add():
+                x_copy = ComplexArray([1., 2., 3.], [0., 0., 0.])
+                x_copy += y
+            self.assertRaises(ValueError, add)
+        self.run_both(check)
+
+    def test_zero_divisor(self):
+        def check():
+            x = ComplexArray([1., 2.], [3., -1.])
+            zero = ComplexArray([1., 0.], [1., 0.])
+            self.assertRaises(ZeroDivisionError, lambda: x / zero)
+            self.assertRaises(ZeroDivisionError, lambda: zero.__rtruediv__(x))
+            self.assertRaises(ZeroDivisionError,
+                              lambda: x / Complex(0., 0.))
+
+            def divide():
+                y = ComplexArray([1., 2.], [3., -1.])
+                y /= zero
+            self.assertRaises(ZeroDivisionError, divide)
+        self.run_both(check)
+
+    def test_inplace_with_itself(self):
+        def check():
+            y = ComplexArray([1., 2.], [3., -1.])
+            y *= y
+            self.assertEqual(str(y), '-8.00+6.00i\n3.00-4.00i')
+            y = ComplexArray([1., 2.], [3., -1.])
+            y /= y
+            self.assertEqual(str(y), '1.00+0.00i\n1.00+0.00i')
+        self.run_both(check)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,8 @@
 import math
 
 class Points(object):
+    __slots__ = ('x', 'y', 'z')
+
     def __init__(self, x, y, z):
         self.x = x
         self.y = y
@@ -16,6 +18,11 @@ class Points(object):
     def absolute(self):
         return pow((self.x ** 2 + self.y ** 2 + self.z ** 2), 0.5)
 
+def torsional_angle(a, b, c, d):
+    x = (b - a).cross(c - b)
+    y = (c - b).cross(d - c)
+    return math.degrees(math.acos(x.dot(y) / (x.absolute() * y.absolute())))
+
 if __name__ == '__main__':
     points = list()
     for i in range(4):
@@ -23,8 +30,5 @@ if __name__ == '__main__':
         points.append(a)
 
     a, b, c, d = Points(*points[0]), Points(*points[1]), Points(*points[2]), Points(*points[3])
-    x = (b - a).cross(c - b)
-    y = (c - b).cross(d - c)
-    angle = math.acos(x.dot(y) / (x.absolute() * y.absolute()))
 
-    print "%.2f" % math.degrees(angle)
\ No newline at end of file
+    print("%.2f" % torsional_angle(a, b, c, d))
\ No newline at end of file
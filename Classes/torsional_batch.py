@@ -0,0 +1,75 @@
+from __future__ import print_function
+
+import math
+import sys
+import time
+
+import numpy
+
+from torsional_angle import Points, torsional_angle
+
+
+CHUNK_FRAMES = 1024
+
+
+def dihedrals(coords, signed=False):
+    """Angles in degrees for an (N, 4, 3) array of atom quadruples.
+
+    Uses atan2 of the projections on the two normals, which stays accurate
+    near 0 and 180 degrees where acos loses precision. Unsigned angles are
+    the same as torsional_angle gives, signed ones follow the IUPAC sign."""
+    coords = numpy.asarray(coords, dtype=numpy.float64)
+    b1 = coords[:, 1] - coords[:, 0]
+    b2 = coords[:, 2] - coords[:, 1]
+    b3 = coords[:, 3] - coords[:, 2]
+    n1 = numpy.cross(b1, b2)
+    n2 = numpy.cross(b2, b3)
+    b2 /= numpy.linalg.norm(b2, axis=1)[:, numpy.newaxis]
+    m1 = numpy.cross(n1, b2)
+    x = numpy.einsum('ij,ij->i', n1, n2)
+    y = numpy.einsum('ij,ij->i', m1, n2)
+    if not signed:
+        y = numpy.abs(y)
+    else:
+        y = -y
+    return numpy.degrees(numpy.arctan2(y, x))
+
+
+def dihedrals_indexed(positions, quadruples, signed=False):
+    """Angles for (K, 4) atom indices into an (M, 3) positions array."""
+    positions = numpy.asarray(positions, dtype=numpy.float64)
+    return dihedrals(positions[numpy.asarray(quadruples)], signed)
+
+
+def dihedrals_from_file(path, n_atoms, quadruples, dtype=numpy.float64,
+                        chunk_frames=CHUNK_FRAMES, signed=False):
+    """Yield (frames, K) angle arrays for a raw trajectory file of
+    (frames, n_atoms, 3) coordinates, reading chunk_frames frames at a
+    time through a memory map."""
+    trajectory = numpy.memmap(path, dtype=dtype, mode='r')
+    trajectory = trajectory.reshape(-1, n_atoms, 3)
+    quadruples = numpy.asarray(quadruples)
+    for start in range(0, len(trajectory), chunk_frames):
+        frames = trajectory[start:start + chunk_frames]
+        coords = frames[:, quadruples].reshape(-1, 4, 3)
+        yield dihedrals(coords, signed).reshape(len(frames), len(quadruples))
+
+
+def benchmark(n):
+    coords = numpy.random.RandomState(0).uniform(-10, 10, (n, 4, 3))
+    start = time.time()
+    expected = [torsional_angle(*[Points(*atom) for atom in quadruple])
+                for quadruple in coords.tolist()]
+    loop_time = time.time() - start
+    start = time.time()
+    angles = dihedrals(coords)
+    batch_time = time.time() - start
+    print('%d quadruples: Points loop %.3f s, batch %.3f s, %.0fx faster, '
+          'max difference %.2e degrees' % (
+              n, loop_time, batch_time, loop_time / max(batch_time, 1e-9),
+              numpy.max(numpy.abs(angles - expected))))
+
+
+if __name__ == '__main__':
+    for n in [int(arg) for arg in sys.argv[1:]] or [10**3, 10**5, 10**6]:
+        benchmark(n)
@@ -0,0 +1,65 @@
+from __future__ import print_function
+
+import os
+import random
+import sys
+import timeit
+
+from name_directory import name_format
+from standardize_mobile_number import sort_phone, sort_phone_external
+
+SIZES = [10**5, 10**6, 10**7]
+IN_MEMORY_LIMIT = 10**6
+RUN_SIZE = 10**6
+PREFIXES = ['+91', '91', '0', '']
+
+
+def phone_numbers(count, seed=0):
+    rand = random.Random(seed)
+    for _ in range(count):
+        yield '%s%d' % (rand.choice(PREFIXES),
+                        rand.randint(7 * 10**9, 10**10 - 1))
+
+
+def people(count, seed=0):
+    rand = random.Random(seed)
+    for i in range(count):
+        yield ['Name%d' % i, 'Surname', str(rand.randint(1, 99)),
+               rand.choice('MF')]
+
+
+def consume(rows):
+    for _ in rows:
+        pass
+
+
+def quiet(function):
+    # the sorted numbers are printed to devnull
+    def run():
+        stdout = sys.stdout
+        sys.stdout = open(os.devnull, 'w')
+        try:
+            function()
+        finally:
+            sys.stdout.close()
+            sys.stdout = stdout
+    return run
+
+
+def measure(name, function, count):
+    seconds = timeit.timeit(function, number=1)
+    print('%-40s %10.2f s %12.0f records/s' % (name, seconds, count / seconds))
+
+
+if __name__ == '__main__':
+    for size in [int(arg) for arg in sys.argv[1:]] or SIZES:
+        print('%d records' % size)
+        if size <= IN_MEMORY_LIMIT:
+            measure('sort_phone', quiet(lambda: sort_phone(
+                phone_numbers(size))), size)
+            measure('name_format', lambda: consume(name_format(
+                people(size))), size)
+        measure('sort_phone_external', quiet(lambda: sort_phone_external(
+            phone_numbers(size), run_size=RUN_SIZE)), size)
+        measure('name_format external', lambda: consume(name_format(
+            people(size), run_size=RUN_SIZE)), size)
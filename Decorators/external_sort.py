@@ -0,0 +1,66 @@
+"""Sorting of iterables that do not fit in memory.
+
+The items are sorted in runs of run_size, every run is spilled to a temp
+file with marshal and the runs are merged lazily, so only one item of every
+run is in memory while merging. Items and keys have to be marshallable
+(numbers, strings, tuples, lists, dicts). The sort is stable.
+"""
+from heapq import merge
+from itertools import islice
+import marshal
+import tempfile
+
+RUN_SIZE = 10**6
+
+
+def write_run(run):
+    run_file = tempfile.TemporaryFile()
+    for entry in run:
+        marshal.dump(entry, run_file)
+    run_file.seek(0)
+    return run_file
+
+
+def read_run(run_file, number, keyed):
+    # the key, the number of the run and the position in it keep the merge
+    # stable and never compare the items themselves
+    position = 0
+    try:
+        while True:
+            try:
+                entry = marshal.load(run_file)
+            except EOFError:
+                return
+            key, item = entry if keyed else (entry, entry)
+            yield key, number, position, item
+            position += 1
+    finally:
+        run_file.close()
+
+
+def external_sort(items, key=None, run_size=RUN_SIZE):
+    items = iter(items)
+    run_files = []
+    try:
+        while True:
+            run = list(islice(items, run_size))
+            if not run:
+                break
+            if key is None:
+                run.sort()
+            else:
+                run.sort(key=key)
+            if not run_files and len(run) < run_size:
+                # everything fits in one run, nothing to spill
+                for item in run:
+                    yield item
+                return
+            run_files.append(write_run(
+                run if key is None else [(key(item), item) for item in run]))
+    except BaseException:
+        for run_file in run_files:
+            run_file.close()
+        raise
+    for entry in merge(*[read_run(run_file, number, key is not None)
+                         for number, run_file in enumerate(run_files)]):
+        yield entry[3]
@@ -1,11 +1,18 @@
 import operator
+import sys
+from itertools import islice
+
+from external_sort import external_sort
 
 def person_lister(f):
-    def inner(people):
-        getage = operator.itemgetter(2)
-        for person in people:
-            person[2] = int(person[2]) 
-        return map(f, sorted(people, key = getage))
+    def inner(people, run_size=None):
+        # people can be a generator and are not changed, with run_size they
+        # are sorted on disk in runs of run_size and the result is lazy
+        getage = lambda person: int(person[2])
+        if run_size is None:
+            return map(f, sorted(people, key = getage))
+        return (f(person) for person in
+                external_sort(people, key=getage, run_size=run_size))
     return inner
 
 @person_lister
@@ -13,5 +20,7 @@ def name_format(person):
     return ("Mr. " if person[3] == "M" else "Ms. ") + person[0] + " " + person[1]
 
 if __name__ == '__main__':
-    people = [raw_input().split() for i in range(int(raw_input()))]
-    print '\n'.join(name_format(people))
\ No newline at end of file
+    people = (line.split() for line in
+              islice(sys.stdin, int(sys.stdin.readline())))
+    sys.stdout.writelines(name + '\n' for name in
+                          name_format(people, run_size=10**6))
@@ -1,13 +1,31 @@
+import sys
+from itertools import islice
+
+from external_sort import RUN_SIZE, external_sort
+
+# the last ten digits are the number, so +91, 91 and 0 prefixes and plain
+# ten digit numbers give the same result
+NUMBER_FORMAT = '+91 %s %s'
+
+
 def wrapper(f):
-    def fun(l):
-        return f (['+91 '+phone_number[-10:-5]+' '+ 
-                  phone_number[-5:] for phone_number in l])
+    def fun(l, *args, **kwargs):
+        # l can be a generator, the numbers are formatted lazily
+        return f((NUMBER_FORMAT % (phone_number[-10:-5], phone_number[-5:])
+                  for phone_number in (line.strip() for line in l)),
+                 *args, **kwargs)
     return fun
 
 @wrapper
 def sort_phone(l):
-    print '\n'.join(sorted(l))
+    print('\n'.join(sorted(l)))
+
+
+@wrapper
+def sort_phone_external(l, run_size=RUN_SIZE):
+    sys.stdout.writelines(phone_number + '\n'
+                          for phone_number in external_sort(l,
+                                                            run_size=run_size))
 
 if __name__ == '__main__':
-    l = [raw_input() for _ in range(int(input()))]
-    sort_phone(l) 
\ No newline at end of file
+    sort_phone_external(islice(sys.stdin, int(sys.stdin.readline())))
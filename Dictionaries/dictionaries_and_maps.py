@@ -5,10 +5,13 @@ for i in range(n):
     record = raw_input().split()
     phoneBook[record[0]] = record[1]
 
-name = raw_input()
-while name!=False:   
+# the names go until EOF, see phone_book.py for big inputs
+while True:
+    try:
+        name = raw_input()
+    except EOFError:
+        break
     if name in phoneBook:
         print (name+'='+phoneBook[name])
     else:
         print ("Not found")
-    name = raw_input()
@@ -0,0 +1,188 @@
+"""Phone book of the Dictionaries and Maps task for big inputs.
+
+Input: the number of entries n, n lines "name phone", then names to look up
+until EOF. Output: "name=phone" or "Not found" for every name.
+
+Usage: python phone_book.py < input.txt
+       python phone_book.py --build-index entries.txt book.idx
+       python phone_book.py --index book.idx < names.txt
+"""
+from bisect import bisect_right
+from itertools import groupby, islice
+import io
+import mmap
+from operator import itemgetter
+import os
+import shutil
+import struct
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir, 'Decorators'))
+
+from external_sort import RUN_SIZE, external_sort
+
+BUFFER_SIZE = 1024 * 1024
+BATCH_SIZE = 64 * 1024  # answers written at once
+BLOCK_SIZE = 64  # records of the index looked through at once
+NOT_FOUND = 'Not found'
+HEADER = struct.Struct('<Q')
+OFFSET = struct.Struct('<Q')
+
+
+def read_entries(lines, n=None):
+    # (name, phone) pairs of the lines, the first n of them if n is given
+    if n is not None:
+        lines = islice(lines, n)
+    for line in lines:
+        record = line.split()
+        if record:
+            yield record[0], record[1]
+
+
+def load_phone_book(lines, n=None):
+    return dict(read_entries(lines, n))
+
+
+def answer(phone_book, name):
+    phone = phone_book.get(name)
+    if phone is None:
+        return NOT_FOUND
+    return name + '=' + phone
+
+
+def iter_answers(phone_book, names, batch_size=BATCH_SIZE):
+    # blocks of batch_size answers joined in one string
+    names = (name.strip() for name in names)
+    while True:
+        batch = [answer(phone_book, name)
+                 for name in islice(names, batch_size)]
+        if not batch:
+            return
+        yield '\n'.join(batch) + '\n'
+
+
+def answer_queries(phone_book, names, output, batch_size=BATCH_SIZE):
+    for block in iter_answers(phone_book, names, batch_size):
+        output.write(block)
+
+
+class PhoneBookIndex(object):
+    """Sorted phone book on disk, read through mmap.
+
+    The file has the number of entries, their offsets from the start of
+    the records and then the sorted "name\tphone\n" records. Only the first
+    name of every block of block_size records is kept in memory, a name is
+    looked for in its block, so a large book is not loaded into memory at
+    startup.
+    """
+
+    def __init__(self, path, block_size=BLOCK_SIZE):
+        self.file = open(path, 'rb')
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.count = HEADER.unpack_from(self.map, 0)[0]
+        self.records_start = HEADER.size + OFFSET.size * self.count
+        self.block_size = block_size
+        self.blocks = [self.get_offset(i)
+                       for i in range(0, self.count, block_size)]
+        self.blocks.append(len(self.map))
+        self.block_names = [self.map[start:self.map.find(b'\t', start)]
+                            for start in self.blocks[:-1]]
+
+    @staticmethod
+    def build(entries, path, run_size=RUN_SIZE):
+        # entries are (name, phone) pairs, the last phone of a name is kept.
+        # They are sorted by external_sort in runs of run_size spilled to
+        # temp files, the offsets and the records are written to temp files
+        # as the sorted entries come and joined at the end, so the book is
+        # never held in memory
+        entries = ((name.encode('utf-8'), phone.encode('utf-8'))
+                   for name, phone in entries)
+        count = offset = 0
+        with tempfile.TemporaryFile() as offsets, \
+                tempfile.TemporaryFile() as records:
+            for name, group in groupby(external_sort(entries, itemgetter(0),
+                                                     run_size),
+                                       itemgetter(0)):
+                for _, phone in group:
+                    pass
+                record = name + b'\t' + phone + b'\n'
+                offsets.write(OFFSET.pack(offset))
+                records.write(record)
+                offset += len(record)
+                count += 1
+            with open(path, 'wb') as index:
+                index.write(HEADER.pack(count))
+                for part in (offsets, records):
+                    part.seek(0)
+                    shutil.copyfileobj(part, index, BUFFER_SIZE)
+
+    def get_offset(self, i):
+        return self.records_start + OFFSET.unpack_from(
+            self.map, HEADER.size + OFFSET.size * i)[0]
+
+    def get(self, name, default=None):
+        key = name.encode('utf-8')
+        i = bisect_right(self.block_names, key) - 1
+        if i < 0:
+            return default
+        block = b'\n' + self.map[self.blocks[i]:self.blocks[i + 1]]
+        start = block.find(b'\n' + key + b'\t')
+        if start == -1:
+            return default
+        start += len(key) + 2
+        return block[start:block.find(b'\n', start)].decode('utf-8')
+
+    def __contains__(self, name):
+        return self.get(name) is not None
+
+    def __len__(self):
+        return self.count
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def open_text(stream):
+    # buffered text reading of a binary stream, stdin by default
+    return io.TextIOWrapper(io.BufferedReader(stream, BUFFER_SIZE),
+                            encoding='utf-8')
+
+
+def main(argv):
+    stdin = open_text(io.open(sys.stdin.fileno(), 'rb', closefd=False))
+    stdout = io.open(sys.stdout.fileno(), 'w', encoding='utf-8',
+                     buffering=BUFFER_SIZE, closefd=False)
+    try:
+        run(argv, stdin, stdout)
+    finally:
+        stdout.close()
+
+
+def run(argv, stdin, stdout):
+    if argv[:1] == ['--build-index']:
+        with io.open(argv[1], encoding='utf-8',
+                     buffering=BUFFER_SIZE) as lines:
+            PhoneBookIndex.build(read_entries(lines), argv[2])
+        return
+    if argv[:1] == ['--index']:
+        with PhoneBookIndex(argv[1]) as phone_book:
+            answer_queries(phone_book, stdin, stdout)
+        return
+    line = next(stdin, '').strip()
+    if not line:
+        return
+    phone_book = load_phone_book(stdin, int(line))
+    answer_queries(phone_book, stdin, stdout)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,144 @@
+"""Batch integer division of the Exceptions task.
+
+Input: the number of rows T and T rows "a b". Output: a // b for every row,
+or "Error Code: ..." with the message of the ValueError or
+ZeroDivisionError the row raises.
+
+The rows are parsed in bulk and the rows which are plain integers with a
+non-zero divisor are found with masks, so only the rows which fail go
+through int() and the division with exceptions. That gives the same
+messages as before. The quotients are computed in one NumPy pass, or in a
+plain loop without NumPy, and the output is written at once.
+"""
+from operator import itemgetter
+import sys
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+ERROR_FORMAT = 'Error Code: %s'
+MAX_DIGITS = 18  # longer numbers may not fit in int64
+SIGNS = '+-'
+DIGITS = '0123456789'
+
+if numpy is not None:
+    WHITESPACE = numpy.zeros(256, dtype=bool)
+    WHITESPACE[[ord(space) for space in ' \t\n\r\x0b\x0c']] = True
+
+if str is bytes:
+    to_str = str
+else:
+    def to_str(token):
+        return token.decode('utf-8', 'replace')
+
+
+def divide(a, b):
+    # one row the way the task does it, with the exceptions
+    try:
+        return str(int(a) // int(b))
+    except ValueError as e:
+        return ERROR_FORMAT % e
+    except ZeroDivisionError as e:
+        return ERROR_FORMAT % e
+
+
+def is_plain_int(token):
+    # a number int() reads for sure, other tokens go through divide
+    digits = token.lstrip(SIGNS)
+    return (digits != '' and not digits.strip(DIGITS) and
+            len(token) - len(digits) <= 1 and len(digits) <= MAX_DIGITS)
+
+
+def divide_rows(rows):
+    # pure Python version, rows are (a, b) pairs of str
+    lines = []
+    append = lines.append
+    for a, b in rows:
+        if is_plain_int(a) and is_plain_int(b) and b.lstrip(SIGNS + '0'):
+            append(str(int(a) // int(b)))
+        else:
+            append(divide(a, b))
+    return lines
+
+
+def find_plain_rows(data, count):
+    # the line of every byte, the positions of the line ends and a mask of
+    # the rows which are two plain integers, found with masks over the
+    # bytes
+    is_space = WHITESPACE[data]
+    is_digit = (data >= ord('0')) & (data <= ord('9'))
+    is_sign = (data == ord('+')) | (data == ord('-'))
+    newline = data == ord('\n')
+    line = numpy.cumsum(newline, dtype=numpy.int32) - newline
+    follows_space = numpy.ones(len(data), dtype=bool)
+    follows_space[1:] = is_space[:-1]
+    before_digit = numpy.zeros(len(data), dtype=bool)
+    before_digit[:-1] = is_digit[1:]
+    bad = ~(is_space | is_digit | is_sign)
+    bad |= is_sign & ~(follows_space & before_digit)
+    starts = numpy.flatnonzero(~is_space & follows_space)
+    ends = numpy.flatnonzero(is_space[1:] & ~is_space[:-1]) + 1
+    if len(ends) < len(starts):
+        ends = numpy.append(ends, len(data))
+    plain = numpy.bincount(line[starts], minlength=count)[:count] == 2
+    digits = ends - starts - is_sign[starts]
+    long_lines = line[starts[digits > MAX_DIGITS]]
+    plain[long_lines[long_lines < count]] = False
+    bad_lines = line[bad]
+    plain[bad_lines[bad_lines < count]] = False
+    return line, numpy.flatnonzero(newline), plain
+
+
+def divide_buffer(body, count):
+    # NumPy version, the plain rows are parsed by one numpy.fromstring and
+    # divided at once, the others go through divide
+    data = numpy.frombuffer(body, dtype=numpy.uint8)
+    line, line_ends, plain = find_plain_rows(data, count)
+    keep = plain[numpy.minimum(line, count - 1)] & (line < count)
+    numbers = numpy.fromstring(data[keep].tobytes(), dtype=numpy.int64,
+                               sep=' ')
+    a, b = numbers[0::2], numbers[1::2]
+    zero = b == 0
+    lines = numpy.empty(count, dtype=object)
+    lines[plain] = list(map(str, (a // numpy.where(zero, 1, b)).tolist()))
+    line_starts = numpy.concatenate(([0], line_ends + 1))
+    line_ends = numpy.append(line_ends, len(body))
+    for i in numpy.flatnonzero(~plain).tolist():
+        values = body[line_starts[i]:line_ends[i]].split()
+        lines[i] = divide(to_str(values[0]), to_str(values[1]))
+    for i, a_value in zip(numpy.flatnonzero(plain)[zero].tolist(),
+                          a[zero].tolist()):
+        lines[i] = divide(str(a_value), '0')
+    return lines.tolist()
+
+
+def read_rows(data):
+    # (a, b) columns of the rows, the first line is their number
+    lines = data.split(b'\n', 1)
+    count = int(lines[0])
+    rows = [line.split() for line in
+            (lines[1].split(b'\n', count)[:count] if count else [])]
+    return list(map(itemgetter(0), rows)), list(map(itemgetter(1), rows))
+
+
+def divide_all(data):
+    if numpy is not None:
+        lines = data.split(b'\n', 1)
+        count = int(lines[0])
+        if count and len(lines) > 1:
+            return divide_buffer(lines[1], count)
+    a_tokens, b_tokens = read_rows(data)
+    return divide_rows(zip(map(to_str, a_tokens), map(to_str, b_tokens)))
+
+
+def main():
+    stdin = getattr(sys.stdin, 'buffer', sys.stdin)
+    lines = divide_all(stdin.read())
+    if lines:
+        sys.stdout.write('\n'.join(lines) + '\n')
+
+
+if __name__ == '__main__':
+    main()
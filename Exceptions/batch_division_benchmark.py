@@ -0,0 +1,52 @@
+from __future__ import print_function
+
+import io
+import random
+import sys
+import timeit
+
+from batch_division import divide_all, divide_rows, numpy, to_str
+
+SIZES = [10**5, 10**6]
+ERROR_RATE = 0.01
+
+
+def make_input(count, rand):
+    rows = [str(count)]
+    for _ in range(count):
+        a, b = rand.randint(-10**9, 10**9), rand.randint(-1000, 1000) or 1
+        if rand.random() < ERROR_RATE:
+            b = rand.choice(['0', '$', 'x1'])
+        rows.append('%s %s' % (a, b))
+    return ('\n'.join(rows) + '\n').encode()
+
+
+def divide_print(data):
+    # the previous loop with a print for every row, for comparison
+    output = io.StringIO() if str is not bytes else io.BytesIO()
+    ab_list = [line.split() for line in data.decode().splitlines()[1:]]
+    for values in ab_list:
+        try:
+            print(int(values[0]) // int(values[1]), file=output)
+        except ValueError as e:
+            print("Error Code:", e, file=output)
+        except ZeroDivisionError as e:
+            print("Error Code:", e, file=output)
+    return output.getvalue()
+
+
+def measure(name, function, count):
+    seconds = timeit.timeit(function, number=1)
+    print('%-40s %10.3f s %12.0f rows/s' % (name, seconds, count / seconds))
+
+
+if __name__ == '__main__':
+    for size in [int(arg) for arg in sys.argv[1:]] or SIZES:
+        data = make_input(size, random.Random(size))
+        rows = [tuple(map(to_str, line.split()))
+                for line in data.splitlines()[1:]]
+        print('%d rows' % size)
+        measure('try/except and print', lambda: divide_print(data), size)
+        measure('divide_rows', lambda: divide_rows(rows), size)
+        if numpy is not None:
+            measure('divide_all, numpy', lambda: divide_all(data), size)
@@ -0,0 +1,57 @@
+from __future__ import print_function
+
+from itertools import islice
+import os
+import sys
+import timeit
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             '..', 'Generators'))
+
+from fibonacci import fib
+from fibonacci_cycle import fib3
+from fibonacci_fast import fib as fast_fib, fib_many, memo
+from fibonacci_rec2 import fib2
+from generators import fib as fib_generator
+
+NS = [10, 100, 1000, 10**4, 10**5, 10**6]
+
+
+def generator_fib(n):
+    # the generator starts with 1, 1, so it is one index ahead of fib
+    return next(islice(fib_generator(), n - 2, None)) if n > 1 else 0
+
+
+def cold_fast_fib(n):
+    memo.clear()
+    return fast_fib(n)
+
+
+# variant: (function, largest n it can finish in reasonable time)
+VARIANTS = [
+    ('fibonacci.fib', fib, 25),
+    ('fibonacci_rec2.fib2', fib2, sys.getrecursionlimit() - 50),
+    ('fibonacci_cycle.fib3', fib3, 10**5),
+    ('generators.fib', generator_fib, 10**5),
+    ('fibonacci_fast.fib cold', cold_fast_fib, 10**6),
+    ('fibonacci_fast.fib memo', fast_fib, 10**6),
+]
+
+
+if __name__ == '__main__':
+    ns = [int(arg) for arg in sys.argv[1:]] or NS
+    print('%-26s' % 'n' + ''.join('%12d' % n for n in ns))
+    for name, function, limit in VARIANTS:
+        row = '%-26s' % name
+        for n in ns:
+            if n > limit:
+                row += '%12s' % '-'
+                continue
+            number = 3 if n > 1000 else 100
+            seconds = timeit.timeit(lambda: function(n), number=number)
+            row += '%12.6f' % (seconds / number)
+        print(row)
+    memo.clear()
+    many = sorted(ns * 10)
+    seconds = timeit.timeit(lambda: fib_many(many), number=1)
+    print('fib_many of %d indexes: %.6f s' % (len(many), seconds))
@@ -0,0 +1,75 @@
+from collections import OrderedDict
+import threading
+
+CACHE_SIZE = 1024
+
+
+class LRUCache(object):
+    def __init__(self, size=CACHE_SIZE):
+        self.size = size
+        self.items = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            value = self.items.pop(key, None)
+            if value is not None:
+                self.items[key] = value
+            return value
+
+    def put(self, key, value):
+        with self.lock:
+            self.items.pop(key, None)
+            self.items[key] = value
+            if len(self.items) > self.size:
+                self.items.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.items.clear()
+
+
+# m: (F(m), F(m+1)) with F(0) = 0, shared by all calls
+memo = LRUCache()
+
+
+def fib_pair(m):
+    # fast doubling: F(2k) = F(k)(2F(k+1) - F(k)), F(2k+1) = F(k)^2 + F(k+1)^2
+    if m == 0:
+        return 0, 1
+    pair = memo.get(m)
+    if pair is None:
+        a, b = fib_pair(m // 2)
+        c = a * (2 * b - a)
+        d = a * a + b * b
+        pair = (d, c + d) if m % 2 else (c, d)
+        memo.put(m, pair)
+    return pair
+
+
+def fib(n):
+    if n < 1:
+        return None
+    return fib_pair(n - 1)[0]
+
+
+def fib_many(ns):
+    # one sweep over the sorted indexes, each step jumps over the gap with
+    # F(m+g) = F(m+1)F(g) + F(m)F(g-1), F(m+g+1) = F(m+1)F(g+1) + F(m)F(g)
+    results = {}
+    m, a, b = 0, 0, 1
+    for n in sorted(set(n for n in ns if n >= 1)):
+        gap = n - 1 - m
+        if gap:
+            c, d = fib_pair(gap)
+            a, b = b * c + a * (d - c), b * d + a * c
+            m = n - 1
+        results[n] = a
+    return [results.get(n) for n in ns]
+
+
+def fib_from(start=1):
+    a, b = fib_pair(max(start, 1) - 1)
+    while 1:
+        yield a
+        a, b = b, a + b
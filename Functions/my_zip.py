@@ -1,11 +1,71 @@
-def my_zip(*args):
-    res_list = []
-    sorted(args, key =len)[0]
-    for i, el in enumerate(sorted(args, key =len)[0]):
-        tuple_list = []
-        for lst in args:
-            tuple_list.append(lst[i])
-        res_list.append(tuple(tuple_list))
-    
-    return(res_list)
+from itertools import chain, islice
+try:
+    from itertools import izip as zip, izip_longest as zip_longest
+except ImportError:
+    from itertools import zip_longest
 
+CHUNK_SIZE = 1024
+
+
+def pop_options(kwargs, **defaults):
+    options = [kwargs.pop(name, default) for name, default in
+               sorted(defaults.items())]
+    if kwargs:
+        raise TypeError('unexpected keyword arguments: ' +
+                        ', '.join(sorted(kwargs)))
+    return options
+
+
+def my_zip(*args, **kwargs):
+    # my_zip(*iterables, strict=False) yields tuples until the shortest
+    # iterable ends, with strict=True iterables of different length raise
+    # ValueError
+    strict, = pop_options(kwargs, strict=False)
+    iterators = [iter(arg) for arg in args]
+    if not iterators:
+        return
+    if not strict:
+        for row in zip(*iterators):
+            yield row
+        return
+    ended = []
+
+    def mark_end(i):
+        # empty generator chained after the iterator to record its end
+        ended.append(i)
+        return
+        yield
+
+    for row in zip(*[chain(iterator, mark_end(i))
+                     for i, iterator in enumerate(iterators)]):
+        yield row
+    # zip stops at the first ended iterator, the iterators before it have
+    # already lost one item and the ones after it must be empty
+    stop = object()
+    if ended[0] > 0 or any(next(iterator, stop) is not stop
+                           for iterator in iterators[1:]):
+        raise ValueError('my_zip() arguments have different lengths')
+
+
+def my_zip_longest(*args, **kwargs):
+    # my_zip_longest(*iterables, fillvalue=None) yields tuples until the
+    # longest iterable ends, missing values are fillvalue
+    fillvalue, = pop_options(kwargs, fillvalue=None)
+    for row in zip_longest(*args, fillvalue=fillvalue):
+        yield row
+
+
+def my_zip_chunks(*args, **kwargs):
+    # my_zip_chunks(*iterables, size=CHUNK_SIZE, strict=False, longest=False,
+    # fillvalue=None) yields lists of up to size tuples
+    fillvalue, longest, size, strict = pop_options(
+        kwargs, size=CHUNK_SIZE, strict=False, longest=False, fillvalue=None)
+    if longest:
+        rows = my_zip_longest(*args, fillvalue=fillvalue)
+    else:
+        rows = my_zip(*args, strict=strict)
+    while 1:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
@@ -0,0 +1,45 @@
+from __future__ import print_function
+
+import sys
+import tempfile
+import timeit
+
+from my_zip import my_zip, my_zip_chunks
+
+SIZES = [10**4, 10**5, 10**6]
+
+
+def my_zip_eager(*args):
+    # the previous list based version, for comparison
+    res_list = []
+    for i, el in enumerate(sorted(args, key=len)[0]):
+        tuple_list = []
+        for lst in args:
+            tuple_list.append(lst[i])
+        res_list.append(tuple(tuple_list))
+    return res_list
+
+
+def consume(rows):
+    for _ in rows:
+        pass
+
+
+def measure(name, function):
+    seconds = timeit.timeit(function, number=1)
+    print('%-40s %10.4f s' % (name, seconds))
+
+
+if __name__ == '__main__':
+    for size in [int(arg) for arg in sys.argv[1:]] or SIZES:
+        a, b, c = list(range(size)), list(range(size * 2)), 'x' * size
+        print('%d rows' % size)
+        measure('eager list version', lambda: my_zip_eager(a, b, c))
+        measure('my_zip', lambda: consume(my_zip(a, b, c)))
+        measure('my_zip strict', lambda: consume(my_zip(a, c, strict=True)))
+        measure('my_zip_chunks', lambda: consume(my_zip_chunks(a, b, c)))
+        with tempfile.TemporaryFile('w+') as lines:
+            lines.writelines('line %d\n' % i for i in range(size))
+            lines.seek(0)
+            measure('my_zip over file lines',
+                    lambda: consume(my_zip(lines, iter(int, 1))))
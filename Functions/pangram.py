@@ -1,4 +1,9 @@
+from functools import partial
+from multiprocessing import Pool
+
 alphabet = "abcdefghijklmnopqrstuvwxyz"
+CHUNK_SIZE = 16 * 1024
+POOL_CHUNK_SIZE = 256
 
 def is_pangramm(phrase):
     for ch in alphabet:
@@ -11,6 +16,81 @@ def is_pangramm(phrase):
 def is_pangramm2(phrase):
     return all([ch in phrase.lower() for ch in alphabet])
 
+
+LETTERS = {}
+
+
+def get_letters(alphabet):
+    # the lowercase letters of the alphabet without repeats, built once
+    letters = LETTERS.get(alphabet)
+    if letters is None:
+        letters = []
+        for ch in alphabet.lower():
+            if ch not in letters:
+                letters.append(ch)
+        letters = LETTERS[alphabet] = tuple(letters)
+    return letters
+
+
+def missing_letters(phrase, alphabet=alphabet):
+    # the phrase is lowered and read once in chunks, the letters of every
+    # chunk are removed from the missing ones, so it stops after the chunk
+    # where every letter of the alphabet is seen
+    letters = get_letters(alphabet)
+    missing = set(letters)
+    for i in range(0, len(phrase), CHUNK_SIZE):
+        missing -= set(phrase[i:i + CHUNK_SIZE].lower())
+        if not missing:
+            return ''
+    return ''.join(ch for ch in letters if ch in missing)
+
+
+def is_pangramm3(phrase, alphabet=alphabet):
+    return not missing_letters(phrase, alphabet)
+
+
+def corpus_missing_letters(lines, alphabet=alphabet):
+    # letters of the alphabet not found in any of the lines, reading stops
+    # at the line where the last letter is seen
+    letters = get_letters(alphabet)
+    missing = set(letters)
+    for line in lines:
+        missing -= set(line.lower())
+        if not missing:
+            return ''
+    return ''.join(ch for ch in letters if ch in missing)
+
+
+def iter_missing_letters(lines, alphabet=alphabet, processes=None):
+    # missing letters of every line in order, '' for pangrams, the lines are
+    # checked by a pool of processes if processes is given
+    check = partial(missing_letters, alphabet=alphabet)
+    if not processes:
+        for line in lines:
+            yield check(line)
+        return
+    pool = Pool(processes)
+    try:
+        for missing in pool.imap(check, lines, POOL_CHUNK_SIZE):
+            yield missing
+    finally:
+        pool.terminate()
+
+
+def check_lines(lines, alphabet=alphabet, processes=None):
+    # returns the list of numbers of the pangram lines and the dict of
+    # missing letters of the other lines by their numbers
+    pangrams = []
+    missing = {}
+    for i, letters in enumerate(iter_missing_letters(lines, alphabet,
+                                                     processes)):
+        if letters:
+            missing[i] = letters
+        else:
+            pangrams.append(i)
+    return pangrams, missing
+
+
 # print(is_pangramm2('Brick quiz whangs jumpy veldt fox!'))
 # print(is_pangramm2("Sphinx of black quartz judge my vow!"))
 # print(is_pangramm2("hello, world!"))
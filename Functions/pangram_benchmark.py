@@ -0,0 +1,33 @@
+from __future__ import print_function
+
+import random
+import sys
+import timeit
+
+from pangram import check_lines, is_pangramm, is_pangramm2, is_pangramm3
+
+SIZES = [10**4, 10**5]
+PROCESSES = 4
+
+
+def make_lines(count, rand):
+    letters = 'abcdefghijklmnopqrstuvwxyz     '
+    return [''.join(rand.choice(letters) for _ in range(rand.randint(40, 2000)))
+            for _ in range(count)]
+
+
+def measure(name, function):
+    seconds = timeit.timeit(function, number=1)
+    print('%-40s %10.4f s' % (name, seconds))
+
+
+if __name__ == '__main__':
+    for size in [int(arg) for arg in sys.argv[1:]] or SIZES:
+        lines = make_lines(size, random.Random(size))
+        print('%d lines' % size)
+        measure('is_pangramm', lambda: [is_pangramm(line) for line in lines])
+        measure('is_pangramm2', lambda: [is_pangramm2(line) for line in lines])
+        measure('is_pangramm3', lambda: [is_pangramm3(line) for line in lines])
+        measure('check_lines', lambda: check_lines(lines))
+        measure('check_lines, %d processes' % PROCESSES,
+                lambda: check_lines(lines, processes=PROCESSES))
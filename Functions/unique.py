@@ -1,3 +1,22 @@
+from heapq import merge
+import io
+import os
+import shutil
+import tempfile
+
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+BUCKETS = 64
+
+
 def unique(L):
     res = []
     i = 0
@@ -11,3 +30,112 @@ def unique(L):
 def unique1(L):
     return [el for el in L if L.count(el) == 1]
 
+
+def unique2(L):
+    # O(n) with a dict of counts, unhashable elements are compared one by
+    # one only with the other unhashable elements
+    counts = {}
+    unhashable = []  # [element, count]
+    for el in L:
+        try:
+            counts[el] = counts.get(el, 0) + 1
+        except TypeError:
+            for item in unhashable:
+                if item[0] == el:
+                    item[1] += 1
+                    break
+            else:
+                unhashable.append([el, 1])
+    if not unhashable:
+        return [el for el in L if counts[el] == 1]
+    res = []
+    for el in L:
+        try:
+            if counts[el] == 1:
+                res.append(el)
+        except TypeError:
+            for item in unhashable:
+                if item[0] == el:
+                    if item[1] == 1:
+                        res.append(el)
+                    break
+    return res
+
+
+def unique_numpy(a):
+    # integer arrays: elements that occur once, in their original order
+    a = numpy.asarray(a)
+    values, first, counts = numpy.unique(a, return_index=True,
+                                         return_counts=True)
+    return a[numpy.sort(first[counts == 1])]
+
+
+class LineSource(object):
+    # re-iterable lines of a text file without the line ends
+    def __init__(self, path):
+        self.path = path
+
+    def __iter__(self):
+        with io.open(self.path, encoding='utf-8') as lines:
+            for line in lines:
+                yield line.rstrip('\n')
+
+
+def iter_records(bucket):
+    # pickled records of a bucket file until its end
+    load = pickle.Unpickler(bucket).load
+    while True:
+        try:
+            yield load()
+        except EOFError:
+            return
+
+
+def unique_stream(source, buckets=BUCKETS):
+    # Two passes over a re-iterable source of hashable, picklable elements
+    # with memory bounded by one bucket. The first pass spills pickled
+    # (position, element) records into bucket files by hash, every bucket
+    # is then counted alone, by the elements themselves, and its positions
+    # of unique elements are kept in order. The second pass walks the
+    # source again and yields elements at the merged unique positions.
+    directory = tempfile.mkdtemp()
+    try:
+        paths = [os.path.join(directory, str(i)) for i in range(buckets)]
+        files = [io.open(path, 'wb') for path in paths]
+        try:
+            dumps = [pickle.Pickler(bucket, pickle.HIGHEST_PROTOCOL).dump
+                     for bucket in files]
+            for position, el in enumerate(source):
+                dumps[hash(el) % buckets]((position, el))
+        finally:
+            for bucket in files:
+                bucket.close()
+
+        for path in paths:
+            counts = {}
+            with io.open(path, 'rb') as bucket:
+                for _, el in iter_records(bucket):
+                    counts[el] = counts.get(el, 0) + 1
+            with io.open(path, 'rb') as bucket:
+                positions = [position for position, el in
+                             iter_records(bucket) if counts[el] == 1]
+            with io.open(path, 'w', encoding='utf-8') as bucket:
+                bucket.writelines(u'%d\n' % position
+                                  for position in positions)
+
+        files = [io.open(path, encoding='utf-8') for path in paths]
+        try:
+            positions = merge(*[(int(line) for line in bucket)
+                                for bucket in files])
+            wanted = next(positions, None)
+            for position, el in enumerate(source):
+                if wanted is None:
+                    break
+                if position == wanted:
+                    yield el
+                    wanted = next(positions, None)
+        finally:
+            for bucket in files:
+                bucket.close()
+    finally:
+        shutil.rmtree(directory)
@@ -0,0 +1,43 @@
+from __future__ import print_function
+
+import io
+import os
+import random
+import sys
+import tempfile
+import timeit
+
+from unique import (LineSource, numpy, unique, unique1, unique2,
+                    unique_numpy, unique_stream)
+
+SIZES = [10**3, 10**4, 10**6]
+QUADRATIC_LIMIT = 10**4  # unique and unique1 take minutes above it
+
+
+def measure(name, function):
+    seconds = timeit.timeit(function, number=1)
+    print('%-40s %10.4f s' % (name, seconds))
+
+
+if __name__ == '__main__':
+    for size in [int(arg) for arg in sys.argv[1:]] or SIZES:
+        rand = random.Random(size)
+        L = [rand.randint(0, size) for _ in range(size)]
+        print('%d elements' % size)
+        if size <= QUADRATIC_LIMIT:
+            measure('unique', lambda: unique(L))
+            measure('unique1', lambda: unique1(L))
+        measure('unique2', lambda: unique2(L))
+        measure('unique2 with unhashable',
+                lambda: unique2(L[:-10] + [[el] for el in L[-10:]]))
+        if numpy is not None:
+            a = numpy.array(L)
+            measure('unique_numpy', lambda: unique_numpy(a))
+        fd, path = tempfile.mkstemp()
+        try:
+            with io.open(fd, 'w', encoding='utf-8') as lines:
+                lines.writelines(u'%d\n' % el for el in L)
+            measure('unique_stream over file lines',
+                    lambda: list(unique_stream(LineSource(path))))
+        finally:
+            os.remove(path)
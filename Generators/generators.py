@@ -7,9 +7,7 @@ def fib():
 
 # testing code
 
-counter = 0
-for n in fib():
-    print(n)
-    counter += 1
-    if counter == 100:
-        break
\ No newline at end of file
+if __name__ == '__main__':
+    from sequence_output import write_sequence
+
+    write_sequence(fib(), 100)
\ No newline at end of file
@@ -0,0 +1,125 @@
+"""Output of long number sequences for the loops and generators tasks.
+
+The numbers are joined into blocks of chunk_size lines and every block is
+written at once to a binary stream, stdout by default, instead of one print
+for every number. Squares are made by adding consecutive odd numbers and
+the Fibonacci numbers come from fib(). Every sequence can start from an
+offset, so an interrupted output can be resumed.
+
+Squares can also be written with a fixed width, one line of width + 1
+bytes for every number, by NumPy when it is installed. Such an output has
+a known size, so it can be written into a memory-mapped file, and line i
+is at byte i * (width + 1).
+"""
+from itertools import islice
+import mmap
+import os
+import sys
+
+from generators import fib
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+CHUNK_SIZE = 64 * 1024  # lines in one block
+
+
+def squares(start=0):
+    # (start + k)**2 for k = 0, 1, ..., the next square is the previous one
+    # plus the next odd number
+    square, odd = start * start, 2 * start + 1
+    while True:
+        yield square
+        square += odd
+        odd += 2
+
+
+def fib_from(offset=0):
+    # fib() without its first offset numbers
+    return islice(fib(), offset, None)
+
+
+def iter_blocks(numbers, count, chunk_size=CHUNK_SIZE):
+    # blocks of up to chunk_size lines of the first count numbers
+    numbers = iter(numbers)
+    while count > 0:
+        lines = list(map(str, islice(numbers, min(chunk_size, count))))
+        if not lines:
+            return
+        count -= len(lines)
+        lines.append('')
+        yield '\n'.join(lines).encode('ascii')
+
+
+def get_stdout():
+    return getattr(sys.stdout, 'buffer', sys.stdout)
+
+
+def write_sequence(numbers, count, stream=None, chunk_size=CHUNK_SIZE):
+    # writes the first count numbers, one in a line, and returns the number
+    # of bytes written
+    stream = stream or get_stdout()
+    written = 0
+    for block in iter_blocks(numbers, count, chunk_size):
+        stream.write(block)
+        written += len(block)
+    stream.flush()
+    return written
+
+
+def get_width(count):
+    # the width of the largest of count squares
+    return len(str((count - 1) ** 2)) if count > 0 else 1
+
+
+def iter_fixed_width_squares(count, offset=0, width=None,
+                             chunk_size=CHUNK_SIZE):
+    # blocks of the squares of offset...count - 1, right-aligned lines of
+    # width characters
+    width = width or get_width(count)
+    for start in range(offset, count, chunk_size):
+        stop = min(start + chunk_size, count)
+        if numpy is None:
+            yield ''.join('%*d\n' % (width, square) for square in
+                          islice(squares(start), stop - start)
+                          ).encode('ascii')
+        else:
+            yield format_fixed_width(numpy.arange(start, stop,
+                                                  dtype=numpy.int64) ** 2,
+                                     width).tobytes()
+
+
+def format_fixed_width(numbers, width):
+    # uint8 array of the numbers as right-aligned lines of width digits
+    lines = numpy.empty((len(numbers), width + 1), dtype=numpy.uint8)
+    powers = 10 ** numpy.arange(width - 1, -1, -1, dtype=numpy.int64)
+    lines[:, :width] = numbers[:, None] // powers % 10 + ord('0')
+    # leading zeros are spaces, the last digit is kept for 0
+    lines[:, :width - 1][numbers[:, None] < powers[:-1]] = ord(' ')
+    lines[:, width] = ord('\n')
+    return lines
+
+
+def write_squares_mmap(path, count, offset=0, width=None,
+                       chunk_size=CHUNK_SIZE):
+    # writes lines offset...count - 1 of the fixed width squares into the
+    # file, which is created or resized to hold all count lines
+    width = width or get_width(count)
+    size = count * (width + 1)
+    with open(path, 'r+b' if os.path.exists(path) else 'w+b') as output:
+        output.truncate(size)
+        if not size:
+            return 0
+        output_map = mmap.mmap(output.fileno(), size)
+        try:
+            position = offset * (width + 1)
+            for block in iter_fixed_width_squares(count, offset, width,
+                                                  chunk_size):
+                output_map[position:position + len(block)] = block
+                position += len(block)
+            output_map.flush()
+        finally:
+            output_map.close()
+    return size - offset * (width + 1)
@@ -0,0 +1,73 @@
+from __future__ import print_function
+
+import os
+import sys
+import tempfile
+import timeit
+
+from generators import fib
+from sequence_output import (iter_fixed_width_squares, numpy, squares,
+                             write_sequence, write_squares_mmap)
+
+SIZES = [10**6, 10**7]  # up to 10**8
+PRINT_LIMIT = 10**7  # one print for every line takes minutes above it
+FIB_LIMIT = 10**4  # the numbers get too long above it
+
+
+def print_squares(n):
+    # the loop of loops.py, for comparison
+    for i in range(n):
+        print (i**2)
+
+
+def print_fib(n):
+    # the loop of generators.py, for comparison
+    counter = 0
+    for number in fib():
+        print(number)
+        counter += 1
+        if counter == n:
+            break
+
+
+def measure(name, function, count, output):
+    stdout = sys.stdout
+    sys.stdout = output
+    try:
+        seconds = timeit.timeit(function, number=1)
+    finally:
+        sys.stdout = stdout
+    print('%-40s %10.2f s %12.0f lines/s' % (name, seconds, count / seconds))
+
+
+if __name__ == '__main__':
+    devnull = open(os.devnull, 'w')
+    binary_devnull = open(os.devnull, 'wb')
+    fd, path = tempfile.mkstemp()
+    os.close(fd)
+    try:
+        for n in [int(arg) for arg in sys.argv[1:]] or SIZES:
+            print('%d lines' % n)
+            if n <= PRINT_LIMIT:
+                measure('squares, print', lambda: print_squares(n), n,
+                        devnull)
+            measure('squares, write_sequence', lambda: write_sequence(
+                squares(), n, binary_devnull), n, devnull)
+            measure('squares, fixed width', lambda: binary_devnull.writelines(
+                iter_fixed_width_squares(n)), n, devnull)
+            measure('squares, fixed width mmap',
+                    lambda: write_squares_mmap(path, n), n, devnull)
+            os.remove(path)
+            fib_count = min(n, FIB_LIMIT)
+            measure('%d fibonacci, print' % fib_count,
+                    lambda: print_fib(fib_count), fib_count, devnull)
+            measure('%d fibonacci, write_sequence' % fib_count,
+                    lambda: write_sequence(fib(), fib_count, binary_devnull),
+                    fib_count, devnull)
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+        devnull.close()
+        binary_devnull.close()
+    if numpy is None:
+        print('fixed width squares were written without NumPy')
@@ -1,10 +1,18 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir, 'Generators'))
+
+from sequence_output import squares, write_sequence
+
 if __name__ == '__main__':
     
     n = int(input())
     
     if  n > 0:
-        for i in range(n):
-            print (i**2)
+        # the squares are written in blocks, see sequence_output.py
+        write_sequence(squares(), n)
     elif n == 0:
         print(n)
     else:
@@ -0,0 +1,220 @@
+"""Module contains class AirportIndex, a shared cache of available routes"""
+
+import json
+from multiprocessing.pool import ThreadPool
+import os
+import tempfile
+import threading
+import time
+
+from metrics import METRICS
+
+
+AIRPORTS_TTL = 24 * 60 * 60
+MAX_WORKERS = 8
+SNAPSHOT_INTERVAL = 60  # seconds between snapshots written on cache misses
+DEPARTURES_PATH = '/html/body/div/div/div/form/dl/dd/select/option/@value'
+
+
+def replace_file(source, target):
+    """This function moves the file over the target, os.rename fails on
+    Windows if the target exists and os.replace is missing in Python 2"""
+
+    if hasattr(os, 'replace'):
+        os.replace(source, target)
+        return
+    if os.name == 'nt' and os.path.exists(target):
+        os.remove(target)
+    os.rename(source, target)
+
+
+class AirportIndex(object):
+    """This class keeps the departure airports and the arrival airports of
+    every departure in memory as sets, so a route is checked without
+    requests to the site. Lists older than ttl seconds are dropped and
+    downloaded again when asked for, and the whole index can be saved to
+    and loaded from a json snapshot. Downloaded lists are saved at most
+    every snapshot_interval seconds and after prefetch, failed saves are
+    counted but do not fail the lookup"""
+
+    def __init__(self, airports_url, get_response_text, ttl=AIRPORTS_TTL,
+                 snapshot_path=None, snapshot_interval=SNAPSHOT_INTERVAL):
+
+        self.airports_url = airports_url
+        self.get_response_text = get_response_text
+        self.ttl = ttl
+        self.snapshot_path = snapshot_path
+        self.snapshot_interval = snapshot_interval
+        self.saved = 0.0  # time of the last snapshot
+        self.unsaved = False  # lists downloaded after the last snapshot
+        self.lock = threading.Lock()
+        # departure code or None for the departures list:
+        # (fetch time, frozenset of airport codes)
+        self.entries = {}
+        self.key_locks = {}
+        if snapshot_path and os.path.exists(snapshot_path):
+            try:
+                self.load(snapshot_path)
+            except (IOError, ValueError, KeyError, TypeError):
+                # a broken snapshot is only a cold start
+                self.clear()
+
+    def is_fresh(self, entry):
+        """This function checks that the entry was fetched less than
+        ttl seconds ago"""
+
+        return entry is not None and time.time() - entry[0] < self.ttl
+
+    def evict_expired(self):
+        """This function drops the lists older than ttl seconds"""
+
+        with self.lock:
+            expired = [key for key, entry in self.entries.items()
+                       if not self.is_fresh(entry)]
+            for key in expired:
+                del self.entries[key]
+        if expired:
+            METRICS.incr('airport_cache_evictions', len(expired))
+
+    def fetch_departures(self):
+        """This function gets the list of departure airports from the site"""
+
+        parsed = self.get_response_text(self.airports_url)
+        return frozenset(filter(None, parsed.xpath(DEPARTURES_PATH)))
+
+    def fetch_arrivals(self, dep_code):
+        """This function gets the list of arrival airports for the departure
+        airport from the site"""
+
+        arr_airports_url = (self.airports_url[:-3] + 'script/getcity/2-' +
+                            dep_code)
+        parsed = self.get_response_text(arr_airports_url)
+        arrival_airports = parsed.xpath('text()')[0].split(',')
+        return frozenset(airport.strip('{}\n\t"')[:3]
+                         for airport in arrival_airports)
+
+    def get_entry(self, key, fetch):
+        """This function returns the cached codes for the key, downloading
+        them with fetch if they are missing or stale. Threads asking for the
+        same key wait for one download instead of making their own"""
+
+        entry = self.entries.get(key)
+        if self.is_fresh(entry):
+            METRICS.incr('airport_cache_hits')
+            return entry[1]
+        with self.lock:
+            key_lock = self.key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            entry = self.entries.get(key)
+            if self.is_fresh(entry):
+                METRICS.incr('airport_cache_hits')
+                return entry[1]
+            METRICS.incr('airport_cache_misses')
+            self.evict_expired()
+            entry = (time.time(), fetch())
+            with self.lock:
+                self.entries[key] = entry
+                self.unsaved = True
+        if (self.snapshot_path and self.unsaved and
+                time.time() - self.saved >= self.snapshot_interval):
+            self.save()
+        return entry[1]
+
+    def get_departures(self):
+        """This function returns the set of departure airports"""
+
+        return self.get_entry(None, self.fetch_departures)
+
+    def get_arrivals(self, dep_code):
+        """This function returns the set of arrival airports for the
+        departure airport"""
+
+        return self.get_entry(dep_code,
+                              lambda: self.fetch_arrivals(dep_code))
+
+    def has_departure(self, dep_code):
+        """This function checks that flights depart from the airport"""
+
+        return dep_code in self.get_departures()
+
+    def has_route(self, dep_code, arr_code):
+        """This function checks that there are flights between the airports"""
+
+        return (self.has_departure(dep_code) and
+                arr_code in self.get_arrivals(dep_code))
+
+    def prefetch(self, max_workers=MAX_WORKERS):
+        """This function fills the arrival lists of every departure airport
+        at once, downloading them concurrently. Expired lists of airports
+        which are no longer departures are dropped"""
+
+        self.evict_expired()
+        departures = sorted(self.get_departures())
+        stale = [code for code in departures
+                 if not self.is_fresh(self.entries.get(code))]
+        if not stale:
+            return
+        pool = ThreadPool(min(max_workers, len(stale)))
+        try:
+            arrivals = pool.map(self.fetch_arrivals, stale)
+        finally:
+            pool.close()
+            pool.join()
+        now = time.time()
+        with self.lock:
+            for code, codes in zip(stale, arrivals):
+                self.entries[code] = (now, codes)
+        self.save()
+
+    def save(self, path=None):
+        """This function writes the index to the json snapshot file through
+        a temporary file in the same directory, which then replaces it.
+        It returns False if the file could not be written"""
+
+        path = path or self.snapshot_path
+        if not path:
+            return True
+        with self.lock:
+            snapshot = {'departures': None, 'arrivals': {}}
+            for code, (fetched, codes) in self.entries.items():
+                if code is None:
+                    snapshot['departures'] = [fetched, sorted(codes)]
+                else:
+                    snapshot['arrivals'][code] = [fetched, sorted(codes)]
+            self.saved = time.time()
+            self.unsaved = False
+        tmp_path = None
+        try:
+            handle, tmp_path = tempfile.mkstemp(
+                dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+            with os.fdopen(handle, 'w') as snapshot_file:
+                json.dump(snapshot, snapshot_file)
+            replace_file(tmp_path, path)
+        except (IOError, OSError):
+            METRICS.incr('airport_snapshot_errors')
+            if tmp_path and os.path.exists(tmp_path):
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+            return False
+        return True
+
+    def load(self, path=None):
+        """This function reads the index from the json snapshot file, the
+        entries keep their fetch time so stale ones are downloaded again"""
+
+        with open(path or self.snapshot_path) as snapshot_file:
+            snapshot = json.load(snapshot_file)
+        with self.lock:
+            if snapshot['departures']:
+                fetched, codes = snapshot['departures']
+                self.entries[None] = (fetched, frozenset(codes))
+            for code, (fetched, codes) in snapshot['arrivals'].items():
+                self.entries[code] = (fetched, frozenset(codes))
+
+    def clear(self):
+        """This function drops all the lists from memory"""
+
+        with self.lock:
+            self.entries = {}
@@ -0,0 +1,220 @@
+"""Module contains the offline benchmark of the Scraper pipeline. It runs
+against FakeServer, so no network access is needed.
+
+Usage: python benchmark.py [rows ...] [--metrics metrics.json]"""
+
+from __future__ import print_function
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+from multiprocessing.pool import ThreadPool
+import random
+import sys
+import time
+
+import requests
+
+from airports import AirportIndex
+from fake_server import ARRIVALS_PATH, QUOTE_PATH, FakeServer
+from fetch import FETCHER, Fetcher
+from flight import Flight
+from metrics import METRICS
+from pairing import cheapest_pairs, pair_flights
+from scraper import Scraper, search_flights
+
+
+SIZES = (100, 1000, 5000)
+FULL_PAIRING_LIMIT = 1000  # all pairs of bigger tables do not fit in memory
+BATCH_SIZE = 50
+TOP_COUNT = 10
+
+
+def query_dates(days=30, nights=7):
+    """This function returns departure and return dates in the format of
+    the site, days and days + nights from today"""
+
+    depdate = datetime.now() + timedelta(days=days)
+    return (depdate.strftime('%d.%m.%Y'),
+            (depdate + timedelta(days=nights)).strftime('%d.%m.%Y'))
+
+
+def make_scraper(server, airport_index, *query):
+    """This function returns Scraper requesting the fake server"""
+
+    scraper = Scraper(*query)
+    scraper.url = server.url
+    scraper.airport_index = airport_index
+    return scraper
+
+
+def make_flights(count, origin, destination, date, rand):
+    """This function returns count random flights for the pairing bench"""
+
+    flights = []
+    for _ in range(count):
+        departure = date + timedelta(minutes=rand.randint(0, 7 * 24 * 60))
+        flights.append(Flight(origin, destination, departure,
+                              departure + timedelta(hours=2),
+                              Decimal(rand.randint(5000, 50000)) / 100,
+                              'EUR'))
+    return flights
+
+
+def naive_pairs(outbound, inbound):
+    """This function pairs every outbound flight with every inbound flight,
+    as a reference for pair_flights"""
+
+    return [(flight, flight2, flight.price + flight2.price)
+            for flight in outbound for flight2 in inbound
+            if flight2.departure > flight.departure]
+
+
+def measure(name, function, count):
+    """This function runs the function once and prints its duration and
+    count per second"""
+
+    start = time.time()
+    function()
+    duration = time.time() - start
+    print('{:<40} {:>10.3f} s {:>14.0f} /s'.format(
+        name, duration, count / duration if duration else float('inf')))
+    return duration
+
+
+def bench_parse(server, airport_index, rows):
+    """This function measures fetching and parsing of the flights table"""
+
+    depdate, rtdate = query_dates()
+    server.rows = rows
+    scraper = make_scraper(server, airport_index, 'BOJ', 'BLL', depdate,
+                           rtdate)
+    measure('parse {} rows'.format(4 * rows),
+            lambda: list(scraper.get_flights_list()), 4 * rows)
+
+
+def bench_pipeline(server, airport_index, rows):
+    """This function measures the whole search with all the round-trip
+    options and with only the cheapest of them"""
+
+    depdate, rtdate = query_dates()
+    server.rows = rows
+    for max_results in ((None, TOP_COUNT) if rows <= FULL_PAIRING_LIMIT
+                        else (TOP_COUNT,)):
+        scraper = make_scraper(server, airport_index, 'BOJ', 'BLL', depdate,
+                               rtdate)
+        scraper.max_results = max_results
+        measure('search {} flights, max_results={}'.format(2 * rows,
+                                                           max_results),
+                scraper.find_flights, 2 * rows)
+
+
+def bench_pairing(count):
+    """This function measures the pairing functions on synthetic flights"""
+
+    rand = random.Random(count)
+    date = datetime.now()
+    outbound = make_flights(count, 'BOJ', 'BLL', date, rand)
+    inbound = make_flights(count, 'BLL', 'BOJ', date, rand)
+    if count <= FULL_PAIRING_LIMIT:
+        measure('naive pairs {}x{}'.format(count, count),
+                lambda: naive_pairs(outbound, inbound), count * count)
+        measure('pair_flights {}x{}'.format(count, count),
+                lambda: list(pair_flights(outbound, inbound)), count * count)
+    measure('cheapest_pairs {} of {}x{}'.format(TOP_COUNT, count, count),
+            lambda: list(cheapest_pairs(outbound, inbound, TOP_COUNT)),
+            count * count)
+
+
+def bench_batch(server):
+    """This function measures the batch search of many queries"""
+
+    server.rows = 20
+    queries = [('BOJ', 'BLL') + query_dates(days, 7)
+               for days in range(1, BATCH_SIZE + 1)]
+    airport_index = AirportIndex(server.airports_url,
+                                 Scraper.get_response_text)
+    measure('batch of {} queries'.format(len(queries)),
+            lambda: search_flights(
+                queries, make_scraper=lambda *query: make_scraper(
+                    server, airport_index, *query)),
+            len(queries))
+
+
+def read_stream(fetcher, url, params):
+    """This function returns the body of the streamed response"""
+
+    response = fetcher.stream(url, params)
+    try:
+        return b''.join(response.iter_content(1024))
+    finally:
+        response.close()
+
+
+def bench_fetch():
+    """This function checks the fetch layer against a slow server failing
+    every third request: retries, coalescing of identical requests and
+    read timeouts"""
+
+    server = FakeServer(latency=0.05, failure_rate=0.3).start()
+    fetcher = Fetcher(rate=None, backoff=0.01, retries=5)
+    pool = ThreadPool(BATCH_SIZE)
+    try:
+        urls = ['{}{}{}'.format(server.base_url, ARRIVALS_PATH, number)
+                for number in range(BATCH_SIZE)]
+        measure('fetch {} pages, 30% failing'.format(len(urls)),
+                lambda: pool.map(fetcher.get, urls), len(urls))
+        server.failure_rate = 0.0
+        measure('fetch 1 page by {} threads'.format(BATCH_SIZE),
+                lambda: pool.map(fetcher.get, [server.airports_url] *
+                                 BATCH_SIZE), BATCH_SIZE)
+        print('requests to the server: {}'.format(sum(server.hits.values())))
+        params = {'aptcode1': 'BOJ', 'aptcode2': 'BLL',
+                  'depdate': query_dates()[0]}
+        bodies = pool.map(
+            lambda _: read_stream(fetcher, server.url, params),
+            range(BATCH_SIZE))
+        print('streamed quote page by {} threads: {} requests, {} '
+              'bodies'.format(BATCH_SIZE, server.hits.get(QUOTE_PATH),
+                              len(set(bodies))))
+        server.latency = 0.5
+        try:
+            Fetcher(rate=None, timeout=(1, 0.1), retries=1).get(
+                server.airports_url)
+        except requests.exceptions.Timeout as exp:
+            print('read timeout: {}'.format(type(exp).__name__))
+    finally:
+        pool.close()
+        pool.join()
+        server.stop()
+
+
+def main(argv):
+    """This function runs all the benchmarks and prints the metrics"""
+
+    metrics_path = None
+    if '--metrics' in argv:
+        metrics_path = argv[argv.index('--metrics') + 1]
+        argv = argv[:argv.index('--metrics')]
+    sizes = [int(size) for size in argv] or SIZES
+
+    FETCHER.rate = None  # the local server needs no rate limit
+    server = FakeServer().start()
+    try:
+        airport_index = AirportIndex(server.airports_url,
+                                     Scraper.get_response_text)
+        for rows in sizes:
+            bench_parse(server, airport_index, rows)
+            bench_pipeline(server, airport_index, rows)
+            bench_pairing(rows)
+        bench_batch(server)
+        bench_fetch()
+    finally:
+        server.stop()
+
+    print(METRICS.to_json())
+    if metrics_path:
+        METRICS.dump(metrics_path)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
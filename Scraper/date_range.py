@@ -0,0 +1,76 @@
+"""Module contains the flexible date range search of round-trip flights"""
+
+from collections import namedtuple
+from datetime import datetime, timedelta
+import heapq
+from operator import itemgetter
+
+import requests
+
+from pairing import cheapest_pairs
+from scraper import MAX_WORKERS, DataError, Scraper, search_flights
+
+
+CHEAPEST_COUNT = 10
+
+DateRangeResult = namedtuple('DateRangeResult',
+                             'dep_dates rt_dates prices cheapest errors')
+
+
+def get_dates(first_date, last_date):
+    """This function returns the list of dates from first_date to last_date
+    inclusive in the format of the site"""
+
+    first = datetime.strptime(first_date, '%d.%m.%Y')
+    last = datetime.strptime(last_date, '%d.%m.%Y')
+    return [(first + timedelta(days=day)).strftime('%d.%m.%Y')
+            for day in range((last - first).days + 1)]
+
+
+def search_date_range(dep_code, arr_code, first_date, last_date,
+                      min_nights, max_nights, max_workers=MAX_WORKERS,
+                      cheapest_count=CHEAPEST_COUNT, fare_store=None):
+    """This function finds round-trip flights departing any day from
+    first_date to last_date and staying from min_nights to max_nights.
+    Every departure date and every return date is requested only once as a
+    one way flight and each result is reused for all date pairs it belongs
+    to, so there are O(days) requests instead of O(days^2). It returns
+    DateRangeResult with the price matrix {(dep_date, rt_date): cheapest
+    total or None}, the cheapest_count cheapest (outbound, inbound, total)
+    combinations and the errors of the one way searches by query"""
+
+    Scraper(dep_code, arr_code, first_date, last_date).check_date_format()
+    dep_dates = get_dates(first_date, last_date)
+    if not dep_dates:
+        raise DataError('Dates are not available\n')
+    rt_dates = get_dates(
+        (datetime.strptime(dep_dates[0], '%d.%m.%Y') +
+         timedelta(days=min_nights)).strftime('%d.%m.%Y'),
+        (datetime.strptime(dep_dates[-1], '%d.%m.%Y') +
+         timedelta(days=max_nights)).strftime('%d.%m.%Y'))
+
+    queries = ([(dep_code, arr_code, date) for date in dep_dates] +
+               [(arr_code, dep_code, date) for date in rt_dates])
+    outbound, inbound, errors = {}, {}, {}
+    results = search_flights(queries, max_workers, fare_store=fare_store)
+    for i, result in enumerate(results):
+        flights = outbound if i < len(dep_dates) else inbound
+        date = result.query[2]
+        flights[date] = result.scraper.converted_flight_list or []
+        if isinstance(result.error, (requests.exceptions.RequestException,
+                                     DataError)):
+            errors[result.query] = result.error
+
+    prices = {}
+    cell_pairs = []
+    for i, dep_date in enumerate(dep_dates):
+        for rt_date in rt_dates[i:i + max_nights - min_nights + 1]:
+            pairs = list(cheapest_pairs(outbound[dep_date], inbound[rt_date],
+                                        cheapest_count))
+            prices[(dep_date, rt_date)] = pairs[0][2] if pairs else None
+            cell_pairs.append(pairs)
+    cheapest = heapq.nsmallest(cheapest_count,
+                               (pair for pairs in cell_pairs
+                                for pair in pairs),
+                               key=itemgetter(2))
+    return DateRangeResult(dep_dates, rt_dates, prices, cheapest, errors)
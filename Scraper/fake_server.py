@@ -0,0 +1,225 @@
+"""Module contains class FakeServer, a local stand-in for the flight sites
+used by the benchmark instead of the network"""
+
+from datetime import datetime
+import gzip
+import io
+import os
+import random
+import threading
+import time
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+    from urllib.parse import parse_qs, urlparse
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+    from urlparse import parse_qs, urlparse
+
+
+ROUTES = {'BOJ': ['BLL', 'CPH', 'VAR'], 'BLL': ['BOJ'], 'CPH': ['BOJ'],
+          'VAR': ['BOJ']}
+AIRPORTS_PATH = '/en/'
+ARRIVALS_PATH = '/script/getcity/2-'
+QUOTE_PATH = '/fly/quote3.aspx'
+
+
+def airports_page(routes):
+    """This function returns the page with the list of departure airports"""
+
+    options = ''.join('<option value="{0}">{0}</option>'.format(code)
+                      for code in sorted(routes))
+    return ('<html><body><div><div><div><form><dl><dd><select>'
+            '<option value="">Select</option>{}</select></dd></dl></form>'
+            '</div></div></div></body></html>'.format(options))
+
+
+def arrivals_page(routes, dep_code):
+    """This function returns the list of arrival airports of the departure
+    airport in the format of the site"""
+
+    return '{' + ','.join('"{0}":"{0}"'.format(code)
+                          for code in routes.get(dep_code, [])) + '}'
+
+
+def flight_rows(dep_code, arr_code, date, count, rand):
+    """This function yields pairs of table rows describing count flights"""
+
+    for _ in range(count):
+        hour, minute = rand.randint(0, 23), rand.choice((0, 15, 30, 45))
+        duration = rand.randint(60, 300)
+        arr_minutes = (hour * 60 + minute + duration) % (24 * 60)
+        yield ('<tr><td>{}</td><td>{:02d}:{:02d}</td><td>{:02d}:{:02d}</td>'
+               '<td>{}</td><td>{}</td></tr>'.format(
+                   date.strftime('%a, %d %b %y'), hour, minute,
+                   arr_minutes // 60, arr_minutes % 60, dep_code, arr_code))
+        yield ('<tr><td>Price:  {}.{:02d} EUR</td>'
+               '<td>NO LUGGAGE INCLUDED IN THE PRICE</td></tr>'.format(
+                   rand.randint(50, 500), rand.randint(0, 99)))
+
+
+def flights_page(params, rows, rand):
+    """This function returns the page with the table of flights for the
+    request parameters, rows flights in every direction"""
+
+    dep_code, arr_code = params['aptcode1'], params['aptcode2']
+    table = ['<tr><th>Date</th><td></td></tr>']
+    table.extend(flight_rows(dep_code, arr_code,
+                             datetime.strptime(params['depdate'],
+                                               '%d.%m.%Y'),
+                             rows, rand))
+    if 'rtdate' in params:
+        table.extend(flight_rows(arr_code, dep_code,
+                                 datetime.strptime(params['rtdate'],
+                                                   '%d.%m.%Y'),
+                                 rows, rand))
+    if not rows:
+        table = ['<tr><td>No available flights found.</td></tr>']
+    return ('<html><body><form><div><table id="flywiz"><tr><td><table>'
+            '{}</table></td></tr></table></div></form></body></html>'.format(
+                ''.join(table)))
+
+
+def gzip_bytes(body):
+    """This function returns the body compressed with gzip"""
+
+    buf = io.BytesIO()
+    with gzip.GzipFile(fileobj=buf, mode='wb') as gzip_file:
+        gzip_file.write(body)
+    return buf.getvalue()
+
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    """This class handles every request in its own thread"""
+
+    daemon_threads = True
+
+
+class FakeServer(object):
+    """This class serves the airports list, the arrival lists and the flight
+    tables on a local port. The pages are generated with rows flights in
+    every direction, or read from fixtures_dir if it has recorded pages
+    (airports.html, getcity-<code>.txt, quote.html). Every response can be
+    delayed by latency seconds and fails with 503 with failure_rate
+    probability. Pages are gzipped for clients accepting it if use_gzip"""
+
+    def __init__(self, rows=20, routes=None, latency=0.0, failure_rate=0.0,
+                 fixtures_dir=None, seed=0, use_gzip=True):
+
+        self.rows = rows
+        self.routes = routes or ROUTES
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.fixtures_dir = fixtures_dir
+        self.use_gzip = use_gzip
+        self.rand = random.Random(seed)
+        self.lock = threading.Lock()
+        self.hits = {}
+        self.server = None
+        self.thread = None
+
+    @property
+    def base_url(self):
+        """This function returns the address of the running server"""
+
+        return 'http://127.0.0.1:{}'.format(self.server.server_address[1])
+
+    @property
+    def airports_url(self):
+        """This function returns the address of the airports page"""
+
+        return self.base_url + AIRPORTS_PATH
+
+    @property
+    def url(self):
+        """This function returns the address of the flights page"""
+
+        return self.base_url + QUOTE_PATH
+
+    def read_fixture(self, name):
+        """This function returns the recorded page or None"""
+
+        if not self.fixtures_dir:
+            return None
+        path = os.path.join(self.fixtures_dir, name)
+        if not os.path.exists(path):
+            return None
+        with io.open(path, encoding='utf-8') as fixture:
+            return fixture.read()
+
+    def get_page(self, path, params):
+        """This function returns the page for the path of the request"""
+
+        if path == AIRPORTS_PATH:
+            return (self.read_fixture('airports.html') or
+                    airports_page(self.routes))
+        if path.startswith(ARRIVALS_PATH):
+            dep_code = path[len(ARRIVALS_PATH):]
+            return (self.read_fixture('getcity-' + dep_code + '.txt') or
+                    arrivals_page(self.routes, dep_code))
+        if path == QUOTE_PATH:
+            with self.lock:
+                rand = random.Random(self.rand.random())
+            return (self.read_fixture('quote.html') or
+                    flights_page(params, self.rows, rand))
+        return None
+
+    def handle(self, handler):
+        """This function answers one request"""
+
+        url = urlparse(handler.path)
+        with self.lock:
+            self.hits[url.path] = self.hits.get(url.path, 0) + 1
+            failed = self.rand.random() < self.failure_rate
+        if self.latency:
+            time.sleep(self.latency)
+        params = dict((key, values[0]) for key, values
+                      in parse_qs(url.query, keep_blank_values=True).items())
+        page = None if failed else self.get_page(url.path, params)
+        if failed:
+            handler.send_response(503)
+            body = b''
+        elif page is None:
+            handler.send_response(404)
+            body = b''
+        else:
+            handler.send_response(200)
+            handler.send_header('Content-Type', 'text/html; charset=utf-8')
+            body = page.encode('utf-8')
+            if (self.use_gzip and 'gzip' in
+                    handler.headers.get('Accept-Encoding', '')):
+                handler.send_header('Content-Encoding', 'gzip')
+                body = gzip_bytes(body)
+        handler.send_header('Content-Length', str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def start(self):
+        """This function starts the server in a background thread"""
+
+        fake_server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            """This class passes requests to the FakeServer"""
+
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):  # pylint: disable=invalid-name
+                fake_server.handle(self)
+
+            def log_message(self, *args):  # pylint: disable=arguments-differ
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """This function stops the server"""
+
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
@@ -0,0 +1,178 @@
+"""Module contains class FareStore, a local SQLite store of found flights"""
+
+from datetime import datetime
+from decimal import Decimal
+import json
+import sqlite3
+import threading
+import time
+
+from flight import Flight
+from metrics import METRICS
+
+
+FRESH_AGE = 15 * 60
+STALE_AGE = 60 * 60
+KEEP_SNAPSHOTS = 10
+DATE_FORMAT = '%Y-%m-%d %H:%M'
+
+
+def dump_flights(flights):
+    """This function converts the list of Flight to a json string"""
+
+    return json.dumps([[flight.origin, flight.destination,
+                        flight.departure.strftime(DATE_FORMAT),
+                        flight.arrival.strftime(DATE_FORMAT),
+                        str(flight.price), flight.currency]
+                       for flight in flights])
+
+
+def load_flights(flights_json):
+    """This function converts the json string back to the list of Flight"""
+
+    return [Flight(origin, destination,
+                   datetime.strptime(departure, DATE_FORMAT),
+                   datetime.strptime(arrival, DATE_FORMAT),
+                   Decimal(price), currency)
+            for origin, destination, departure, arrival, price, currency
+            in json.loads(flights_json)]
+
+
+class FareStore(object):
+    """This class saves snapshots of the converted flight lists with their
+    fetch time, keyed by the request parameters. Snapshots younger than
+    fresh_age seconds are served as they are, snapshots younger than
+    stale_age seconds are served while a new one is fetched in background,
+    older ones are fetched again before serving"""
+
+    def __init__(self, path, fresh_age=FRESH_AGE, stale_age=STALE_AGE,
+                 keep_snapshots=KEEP_SNAPSHOTS):
+
+        self.fresh_age = fresh_age
+        self.stale_age = stale_age
+        self.keep_snapshots = keep_snapshots
+        self.lock = threading.Lock()
+        self.refreshing = set()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        with self.lock, self.connection:
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS snapshots '
+                '(key TEXT, fetched_at REAL, flights TEXT)')
+            self.connection.execute(
+                'CREATE INDEX IF NOT EXISTS snapshots_key '
+                'ON snapshots (key, fetched_at)')
+
+    @staticmethod
+    def make_key(data_params):
+        """This function returns the store key of the request parameters"""
+
+        return json.dumps(sorted(data_params.items()))
+
+    def get_snapshots(self, data_params, count):
+        """This function returns up to count latest (fetch time, flights)
+        snapshots for the request parameters, the latest first"""
+
+        with self.lock:
+            rows = self.connection.execute(
+                'SELECT fetched_at, flights FROM snapshots WHERE key = ? '
+                'ORDER BY fetched_at DESC LIMIT ?',
+                (FareStore.make_key(data_params), count)).fetchall()
+        return [(fetched_at, load_flights(flights))
+                for fetched_at, flights in rows]
+
+    def get(self, data_params):
+        """This function returns the latest (fetch time, flights) snapshot
+        for the request parameters or None"""
+
+        snapshots = self.get_snapshots(data_params, 1)
+        return snapshots[0] if snapshots else None
+
+    def put(self, data_params, flights, fetched_at=None):
+        """This function appends a new snapshot of the flights and deletes
+        the oldest ones over keep_snapshots"""
+
+        key = FareStore.make_key(data_params)
+        with self.lock, self.connection:
+            self.connection.execute(
+                'INSERT INTO snapshots VALUES (?, ?, ?)',
+                (key, fetched_at or time.time(), dump_flights(flights)))
+            self.connection.execute(
+                'DELETE FROM snapshots WHERE key = ? AND fetched_at NOT IN '
+                '(SELECT fetched_at FROM snapshots WHERE key = ? '
+                'ORDER BY fetched_at DESC LIMIT ?)',
+                (key, key, self.keep_snapshots))
+
+    def price_deltas(self, data_params):
+        """This function compares two latest snapshots and returns the list
+        of (flight, old price, price delta) for flights whose price changed"""
+
+        snapshots = self.get_snapshots(data_params, 2)
+        if len(snapshots) < 2:
+            return []
+        old_prices = dict(((flight.origin, flight.destination,
+                            flight.departure), flight.price)
+                          for flight in snapshots[1][1])
+        deltas = []
+        for flight in snapshots[0][1]:
+            old_price = old_prices.get((flight.origin, flight.destination,
+                                        flight.departure))
+            if old_price is not None and old_price != flight.price:
+                deltas.append((flight, old_price, flight.price - old_price))
+        return deltas
+
+    def refresh(self, data_params, fetch):
+        """This function fetches and saves a new snapshot"""
+
+        flights = fetch()
+        self.put(data_params, flights)
+        return flights
+
+    def refresh_in_background(self, data_params, fetch):
+        """This function starts fetching a new snapshot in a thread, unless
+        the snapshot for the same parameters is already being fetched"""
+
+        key = FareStore.make_key(data_params)
+        with self.lock:
+            if key in self.refreshing:
+                return
+            self.refreshing.add(key)
+
+        def run():
+            try:
+                self.refresh(data_params, fetch)
+            except Exception:  # pylint: disable=broad-except
+                # the stale snapshot stays and the next request retries
+                pass
+            finally:
+                with self.lock:
+                    self.refreshing.discard(key)
+
+        thread = threading.Thread(target=run)
+        thread.daemon = True
+        thread.start()
+
+    def load(self, data_params, fetch, background_fetch=None):
+        """This function returns the flights for the request parameters from
+        the store if the snapshot is fresh enough, otherwise fetches them.
+        background_fetch is used for refreshing stale snapshots in a
+        thread, by default it is fetch"""
+
+        snapshot = self.get(data_params)
+        if snapshot is not None:
+            age = time.time() - snapshot[0]
+            if age < self.fresh_age:
+                METRICS.incr('fare_store_hits')
+                return snapshot[1]
+            if age < self.stale_age:
+                METRICS.incr('fare_store_stale_hits')
+                self.refresh_in_background(data_params,
+                                           background_fetch or fetch)
+                return snapshot[1]
+        METRICS.incr('fare_store_misses')
+        return self.refresh(data_params, fetch)
+
+    def close(self):
+        """This function closes the database connection"""
+
+        with self.lock:
+            self.connection.close()
@@ -0,0 +1,381 @@
+"""Module contains class Fetcher, the layer sending all requests of the
+Scraper with rate limits, timeouts, retries and request coalescing"""
+
+from collections import deque
+import random
+import threading
+import time
+try:
+    from urllib.parse import urlparse
+except ImportError:
+    from urlparse import urlparse
+
+import requests
+
+from metrics import METRICS
+
+
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 30
+RETRIES = 3
+BACKOFF = 0.5
+MAX_BACKOFF = 10
+RATE = 20  # requests per second to one host
+BURST = 20
+POOL_SIZE = 16
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+HEADERS = {'Accept-Encoding': 'gzip, deflate', 'Connection': 'keep-alive'}
+
+
+class TokenBucket(object):
+    """This class allows rate requests per second on average and up to
+    burst requests at once"""
+
+    def __init__(self, rate, burst):
+
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.time()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """This function waits until a request is allowed and returns the
+        time waited"""
+
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.time()
+                self.tokens = min(self.burst, self.tokens +
+                                  (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class InFlight(object):
+    """This class keeps the request which is being sent, so identical
+    requests wait for its result"""
+
+    def __init__(self):
+
+        self.done = threading.Event()
+        self.response = None
+        self.error = None
+
+
+class SharedStream(object):
+    """This class reads the body of a streamed response once for all the
+    identical requests sharing it. Every reader keeps its position, a chunk
+    is kept only until all the readers have read it, and the reader which
+    needs a chunk first reads it from the network while the others can read
+    the chunks already kept"""
+
+    def __init__(self):
+
+        self.opened = threading.Event()
+        self.response = None
+        self.error = None
+        self.lock = threading.Lock()
+        self.fill_lock = threading.Lock()  # held while reading the network
+        self.positions = {}  # reader: number of its next chunk
+        self.next_reader = 0
+        self.chunks = deque()
+        self.first = 0  # number of the first kept chunk
+        self.content = None
+        self.finished = False
+
+    def join(self):
+        """This function adds a reader and returns its key, or None if the
+        stream has already dropped chunks or failed to open"""
+
+        with self.lock:
+            if self.first or (self.opened.is_set() and
+                              self.response is None):
+                return None
+            reader = self.next_reader
+            self.next_reader += 1
+            self.positions[reader] = 0
+            return reader
+
+    def leave(self, reader):
+        """This function removes the reader and returns True if it was the
+        last one"""
+
+        with self.lock:
+            del self.positions[reader]
+            self.drop_read_chunks()
+            return not self.positions
+
+    def drop_read_chunks(self):
+        """This function drops the chunks read by all the readers"""
+
+        read = min(self.positions.values()) if self.positions else (
+            self.first + len(self.chunks))
+        while self.first < read and self.chunks:
+            self.chunks.popleft()
+            self.first += 1
+
+    def get_chunk(self, reader, number, chunk_size):
+        """This function returns the chunk of the number, or None after the
+        last one. The chunks before it are read by the reader"""
+
+        while True:
+            with self.lock:
+                if reader not in self.positions:
+                    return None  # the reader is closed
+                self.positions[reader] = number
+                self.drop_read_chunks()
+                if number < self.first + len(self.chunks):
+                    return self.chunks[number - self.first]
+                if self.finished:
+                    if self.error is not None:
+                        raise self.error
+                    return None
+            with self.fill_lock:
+                with self.lock:
+                    if (number < self.first + len(self.chunks) or
+                            self.finished):
+                        continue
+                    if self.content is None:
+                        self.content = self.response.iter_content(chunk_size)
+                chunk = error = None
+                try:
+                    chunk = next(self.content)
+                except StopIteration:
+                    pass
+                except Exception as exp:
+                    error = exp
+                with self.lock:
+                    if chunk is None:
+                        self.error = error
+                        self.finish()
+                    else:
+                        METRICS.incr('bytes_downloaded', len(chunk))
+                        self.chunks.append(chunk)
+
+    def finish(self):
+        """This function closes the response, the chunks kept can still be
+        read"""
+
+        self.finished = True
+        self.response.close()
+
+    def close(self):
+        """This function closes the response when no reader is left"""
+
+        with self.lock:
+            if not self.finished:
+                self.finish()
+
+
+class StreamReader(object):
+    """This class is the response returned by Fetcher.stream, its body is
+    read in chunks from the SharedStream"""
+
+    def __init__(self, fetcher, key, shared, reader):
+
+        self.fetcher = fetcher
+        self.key = key
+        self.shared = shared
+        self.reader = reader
+        self.closed = False
+        self.encoding = shared.response.encoding
+        self.status_code = shared.response.status_code
+        self.headers = shared.response.headers
+        self.url = shared.response.url
+
+    def iter_content(self, chunk_size=1):
+        """This function yields the chunks of the body"""
+
+        number = 0
+        while True:
+            chunk = self.shared.get_chunk(self.reader, number, chunk_size)
+            if chunk is None:
+                return
+            yield chunk
+            number += 1
+
+    def close(self):
+        """This function releases the shared stream"""
+
+        if not self.closed:
+            self.closed = True
+            self.fetcher.release_stream(self.key, self.shared, self.reader)
+
+
+class Fetcher(object):
+    """This class sends GET requests through one keep-alive session per host
+    with connect and read timeouts and a token bucket rate limit per host.
+    Failed connections, timeouts and RETRY_STATUSES responses are retried
+    up to retries times with jittered exponential backoff. Identical
+    requests sent by get or by stream at the same time share one network
+    call"""
+
+    def __init__(self, rate=RATE, burst=BURST,
+                 timeout=(CONNECT_TIMEOUT, READ_TIMEOUT), retries=RETRIES,
+                 backoff=BACKOFF, max_backoff=MAX_BACKOFF,
+                 pool_size=POOL_SIZE):
+
+        self.rate = rate  # None turns the rate limit off
+        self.burst = burst
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.pool_size = pool_size
+        self.lock = threading.Lock()
+        self.sessions = {}
+        self.buckets = {}
+        self.in_flight = {}
+        self.streams = {}
+
+    def get_session(self, host):
+        """This function returns the keep-alive session of the host"""
+
+        with self.lock:
+            session = self.sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                session.headers.update(HEADERS)
+                adapter = requests.adapters.HTTPAdapter(
+                    pool_connections=1, pool_maxsize=self.pool_size)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self.sessions[host] = session
+        return session
+
+    def wait_for_rate_limit(self, host):
+        """This function waits until the rate limit of the host allows one
+        more request"""
+
+        if self.rate is None:
+            return
+        with self.lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                bucket = self.buckets[host] = TokenBucket(self.rate,
+                                                          self.burst)
+        waited = bucket.acquire()
+        if waited:
+            METRICS.observe('rate_limit_wait', waited)
+
+    def get_backoff(self, attempt):
+        """This function returns the random delay before the retry"""
+
+        return random.uniform(0, min(self.max_backoff,
+                                     self.backoff * 2 ** attempt))
+
+    def request(self, url, params='', stream=False):
+        """This function sends the request with retries and returns the
+        response, or raises the error of the last attempt. Streamed
+        responses are retried only until their headers are received"""
+
+        host = urlparse(url).netloc
+        session = self.get_session(host)
+        attempt = 0
+        while True:
+            self.wait_for_rate_limit(host)
+            try:
+                with METRICS.timer('request'):
+                    response = session.get(url, params=params, stream=stream,
+                                           timeout=self.timeout)
+                if (response.status_code not in RETRY_STATUSES or
+                        attempt >= self.retries):
+                    try:
+                        response.raise_for_status()
+                    except requests.exceptions.HTTPError:
+                        response.close()
+                        raise
+                    return response
+                response.close()
+            except (requests.exceptions.ConnectionError,
+                    requests.exceptions.Timeout):
+                if attempt >= self.retries:
+                    raise
+            METRICS.incr('retries')
+            time.sleep(self.get_backoff(attempt))
+            attempt += 1
+
+    @staticmethod
+    def get_key(url, params):
+        """This function returns the key of identical requests"""
+
+        return (url, tuple(sorted(params.items())) if params else ())
+
+    def get(self, url, params=''):
+        """This function returns the response with the body already read.
+        If the same request is being sent by another thread, it waits for
+        that response instead of sending its own"""
+
+        key = Fetcher.get_key(url, params)
+        with self.lock:
+            call = self.in_flight.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = self.in_flight[key] = InFlight()
+        if not is_leader:
+            METRICS.incr('coalesced_requests')
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.response
+
+        try:
+            call.response = self.request(url, params)
+            METRICS.incr('bytes_downloaded', len(call.response.content))
+            return call.response
+        except Exception as exp:
+            call.error = exp
+            raise
+        finally:
+            with self.lock:
+                del self.in_flight[key]
+            call.done.set()
+
+    def stream(self, url, params=''):
+        """This function returns the response whose body is read later in
+        chunks. If the same request is being read by another thread and
+        none of its chunks are dropped yet, the body read by it is shared
+        instead of sending another request"""
+
+        key = Fetcher.get_key(url, params)
+        with self.lock:
+            shared = self.streams.get(key)
+            reader = None if shared is None else shared.join()
+            is_leader = reader is None
+            if is_leader:
+                shared = self.streams[key] = SharedStream()
+                reader = shared.join()
+        if is_leader:
+            try:
+                shared.response = self.request(url, params, stream=True)
+            except Exception as exp:
+                shared.error = exp
+            shared.opened.set()
+        else:
+            METRICS.incr('coalesced_requests')
+            shared.opened.wait()
+        if shared.response is None:
+            self.release_stream(key, shared, reader)
+            raise shared.error
+        return StreamReader(self, key, shared, reader)
+
+    def release_stream(self, key, shared, reader):
+        """This function closes the shared stream when its last reader is
+        closed, identical requests sent later get a new one"""
+
+        with self.lock:
+            is_last = shared.leave(reader)
+            if is_last and self.streams.get(key) is shared:
+                del self.streams[key]
+        if is_last and shared.response is not None:
+            shared.close()
+
+
+FETCHER = Fetcher()
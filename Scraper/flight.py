@@ -0,0 +1,18 @@
+"""Module contains class Flight, the record of one converted flight"""
+
+from collections import namedtuple
+
+
+class Flight(namedtuple('Flight', 'origin destination departure arrival '
+                                  'price currency')):
+    """This class keeps one flight: airports as strings, departure and
+    arrival as datetime objects and price as Decimal. It is a tuple without
+    instance dictionary, so it takes little memory in big flight lists"""
+
+    __slots__ = ()
+
+    @property
+    def duration(self):
+        """This function returns the flight duration as timedelta"""
+
+        return self.arrival - self.departure
@@ -0,0 +1,90 @@
+"""Module contains class Metrics collecting timings and counters of the
+Scraper pipeline stages"""
+
+from contextlib import contextmanager
+import json
+import threading
+import time
+
+
+class Metrics(object):
+    """This class collects counters and stage timings from all threads.
+    Every recorded value is also passed to the callbacks as
+    callback(name, value), so the metrics can be sent elsewhere"""
+
+    def __init__(self):
+
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.timings = {}  # stage name: [count, total seconds, max seconds]
+        self.callbacks = []
+
+    def add_callback(self, callback):
+        """This function adds the function called for every recorded value"""
+
+        self.callbacks.append(callback)
+
+    def remove_callback(self, callback):
+        """This function removes the callback added before"""
+
+        self.callbacks.remove(callback)
+
+    def incr(self, name, value=1):
+        """This function adds the value to the counter"""
+
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+        for callback in self.callbacks:
+            callback(name, value)
+
+    def observe(self, name, seconds):
+        """This function records one duration of the stage"""
+
+        with self.lock:
+            timing = self.timings.setdefault(name, [0, 0.0, 0.0])
+            timing[0] += 1
+            timing[1] += seconds
+            timing[2] = max(timing[2], seconds)
+        for callback in self.callbacks:
+            callback(name, seconds)
+
+    @contextmanager
+    def timer(self, name):
+        """This function measures the duration of the with block"""
+
+        start = time.time()
+        try:
+            yield
+        finally:
+            self.observe(name, time.time() - start)
+
+    def snapshot(self):
+        """This function returns all the metrics as a dictionary"""
+
+        with self.lock:
+            return {'counters': dict(self.counters),
+                    'timings': dict((name, {'count': count, 'total': total,
+                                            'max': longest})
+                                    for name, (count, total, longest)
+                                    in self.timings.items())}
+
+    def to_json(self):
+        """This function returns all the metrics as a json string"""
+
+        return json.dumps(self.snapshot(), indent=2, sort_keys=True)
+
+    def dump(self, path):
+        """This function writes all the metrics to the json file"""
+
+        with open(path, 'w') as metrics_file:
+            metrics_file.write(self.to_json())
+
+    def reset(self):
+        """This function clears all the metrics"""
+
+        with self.lock:
+            self.counters = {}
+            self.timings = {}
+
+
+METRICS = Metrics()
@@ -0,0 +1,104 @@
+"""Module contains functions pairing outbound and inbound flights into
+round-trip options"""
+
+from bisect import bisect_right
+import heapq
+from operator import attrgetter
+
+from metrics import METRICS
+
+
+departure = attrgetter('departure')
+price = attrgetter('price')
+
+
+def pair_flights(outbound, inbound):
+    """This function yields (outbound, inbound, total) for every inbound
+    flight departing after the outbound one. Inbound flights are sorted by
+    departure once and each outbound flight finds its first valid inbound
+    flight by bisection, so only valid pairs are ever looked at"""
+
+    inbound = sorted(inbound, key=departure)
+    inbound_departures = [departure(flight) for flight in inbound]
+    evaluated = 0
+    try:
+        for flight in outbound:
+            start = bisect_right(inbound_departures, departure(flight))
+            for flight2 in inbound[start:]:
+                evaluated += 1
+                yield (flight, flight2, price(flight) + price(flight2))
+    finally:
+        METRICS.incr('pairs_evaluated', evaluated)
+
+
+def build_max_tree(values):
+    """This function returns the size and the list of a segment tree of
+    the maxima of the values, node n has children 2n and 2n + 1 and the
+    values are the leaves from node size on"""
+
+    size = 1
+    while size < len(values):
+        size *= 2
+    tree = [None] * (2 * size)
+    tree[size:size + len(values)] = values
+    for node in range(size - 1, 0, -1):
+        left, right = tree[2 * node], tree[2 * node + 1]
+        tree[node] = left if right is None or (
+            left is not None and left >= right) else right
+    return size, tree
+
+
+def first_greater(size, tree, start, value):
+    """This function returns the first index from start on whose value is
+    greater than the value, or None, in O(log n)"""
+
+    if start >= size:
+        return None
+    node = start + size
+    while tree[node] is None or not tree[node] > value:
+        # the next subtree to the right of the node
+        while node & 1:
+            node >>= 1
+        if not node:
+            return None
+        node += 1
+    while node < size:
+        node *= 2
+        if tree[node] is None or not tree[node] > value:
+            node += 1
+    return node - size
+
+
+def cheapest_pairs(outbound, inbound, k):
+    """This function yields the k cheapest (outbound, inbound, total)
+    combinations in ascending order of total. Both lists are sorted by
+    price and a heap keeps for every outbound flight its cheapest inbound
+    flight not yielded yet which departs after it. The next such inbound
+    flight is found with a segment tree of the latest departures, so pairs
+    where the inbound flight departs first are never looked at and the heap
+    holds at most one pair per outbound flight"""
+
+    if k <= 0 or not outbound or not inbound:
+        return
+    outbound = sorted(outbound, key=price)
+    inbound = sorted(inbound, key=price)
+    size, tree = build_max_tree([departure(flight) for flight in inbound])
+    heap = []
+    for i, flight in enumerate(outbound):
+        j = first_greater(size, tree, 0, departure(flight))
+        if j is not None:
+            heap.append((price(flight) + price(inbound[j]), i, j))
+    heapq.heapify(heap)
+    evaluated = 0
+    try:
+        while heap and k:
+            total, i, j = heapq.heappop(heap)
+            evaluated += 1
+            yield (outbound[i], inbound[j], total)
+            k -= 1
+            j = first_greater(size, tree, j + 1, departure(outbound[i]))
+            if j is not None:
+                heapq.heappush(heap, (price(outbound[i]) + price(inbound[j]),
+                                      i, j))
+    finally:
+        METRICS.incr('pairs_evaluated', evaluated)
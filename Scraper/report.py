@@ -0,0 +1,208 @@
+"""Module contains the structured results of the Scraper, their streaming
+JSON Lines and CSV writers and the command line entry point.
+
+Usage: python report.py queries.txt [-o results.jsonl] [-f jsonl|csv]
+                        [-w workers] [-k max_results]
+
+Every line of the queries file is one query: departure airport, arrival
+airport, departure date and optional return date separated by spaces"""
+
+from __future__ import print_function
+
+import argparse
+import csv
+from decimal import Decimal
+import io
+import json
+import sys
+
+import requests
+
+from scraper import (MAX_WORKERS, DataError, FlightNotFound,
+                     iter_search_flights)
+
+
+DATE_FORMAT = '%Y-%m-%dT%H:%M'
+CSV_FIELDS = ['query', 'status', 'message', 'option',
+              'origin', 'destination', 'departure', 'arrival', 'price',
+              'rt_origin', 'rt_destination', 'rt_departure', 'rt_arrival',
+              'rt_price', 'total', 'currency']
+
+
+def get_status(result):
+    """This function returns the status name of the search result"""
+
+    error = result.error
+    if error is None:
+        return 'ok'
+    if isinstance(error, TypeError):
+        return 'parameters_error'
+    if isinstance(error, DataError):
+        return 'data_error'
+    if isinstance(error, requests.exceptions.RequestException):
+        return 'request_error'
+    if isinstance(error, FlightNotFound):
+        if result.scraper.converted_flight_list:
+            return 'one_direction'
+        return 'not_found'
+    return 'error'
+
+
+def flight_to_dict(flight):
+    """This function returns the flight as a dictionary, the price stays
+    Decimal"""
+
+    return {'origin': flight.origin, 'destination': flight.destination,
+            'departure': flight.departure.strftime(DATE_FORMAT),
+            'arrival': flight.arrival.strftime(DATE_FORMAT),
+            'duration': int(flight.duration.total_seconds()) // 60,
+            'price': flight.price, 'currency': flight.currency}
+
+
+def result_to_dict(result):
+    """This function returns SearchResult as a dictionary with the sorted
+    round-trip options and, if there are none, the sorted flights"""
+
+    data = {'query': list(result.query), 'status': get_status(result),
+            'message': str(result.error).strip() if result.error else '',
+            'round_trips': [], 'flights': []}
+    scraper = result.scraper
+    if scraper is None or isinstance(result.error, (
+            requests.exceptions.RequestException, DataError)):
+        return data
+    data['round_trips'] = [{'outbound': flight_to_dict(outbound),
+                            'inbound': flight_to_dict(inbound),
+                            'total': total, 'currency': outbound.currency}
+                           for outbound, inbound, total
+                           in scraper.get_sorted_round_trips()]
+    if not data['round_trips']:
+        data['flights'] = [flight_to_dict(flight)
+                           for flight in scraper.get_sorted_flights()]
+    return data
+
+
+def encode_decimal(value):
+    """This function writes Decimal to json as a string, so no precision
+    is lost"""
+
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(repr(value) + ' is not JSON serializable')
+
+
+class JsonLinesWriter(object):
+    """This class writes every search result as one json line as soon as
+    it is given"""
+
+    def __init__(self, stream):
+
+        self.stream = stream
+
+    def write(self, result):
+        """This function writes one SearchResult"""
+
+        self.stream.write(json.dumps(result_to_dict(result),
+                                     default=encode_decimal,
+                                     sort_keys=True) + '\n')
+        self.stream.flush()
+
+
+class CsvWriter(object):
+    """This class writes every round-trip option or flight of the search
+    results as one csv row as soon as the result is given"""
+
+    def __init__(self, stream):
+
+        self.writer = csv.DictWriter(stream, CSV_FIELDS)
+        self.stream = stream
+        self.writer.writeheader()
+
+    def write(self, result):
+        """This function writes the rows of one SearchResult"""
+
+        data = result_to_dict(result)
+        row = {'query': ' '.join(data['query']), 'status': data['status'],
+               'message': data['message']}
+        rows = []
+        for i, round_trip in enumerate(data['round_trips']):
+            rows.append(dict(row, option=i + 1, total=round_trip['total'],
+                             currency=round_trip['currency'],
+                             **CsvWriter.flight_fields(round_trip['outbound'],
+                                                       '')))
+            rows[-1].update(CsvWriter.flight_fields(round_trip['inbound'],
+                                                    'rt_'))
+        for i, flight in enumerate(data['flights']):
+            rows.append(dict(row, option=i + 1, total=flight['price'],
+                             currency=flight['currency'],
+                             **CsvWriter.flight_fields(flight, '')))
+        self.writer.writerows(rows or [row])
+        self.stream.flush()
+
+    @staticmethod
+    def flight_fields(flight, prefix):
+        """This function returns csv fields of the flight"""
+
+        return dict((prefix + name, flight[name]) for name in
+                    ('origin', 'destination', 'departure', 'arrival',
+                     'price'))
+
+
+WRITERS = {'jsonl': JsonLinesWriter, 'csv': CsvWriter}
+
+
+def read_queries(lines):
+    """This function yields queries from the lines of the queries file,
+    empty lines and lines starting with # are skipped"""
+
+    for line in lines:
+        line = line.strip()
+        if line and not line.startswith('#'):
+            yield line.split()
+
+
+def write_results(results, writer):
+    """This function writes the search results one by one and returns their
+    number"""
+
+    count = 0
+    for result in results:
+        writer.write(result)
+        count += 1
+    return count
+
+
+def main(argv=None):
+    """This function searches flights for the queries file and writes the
+    results as they are found"""
+
+    parser = argparse.ArgumentParser(
+        description='Search flights for every query of the file')
+    parser.add_argument('queries', help='queries file, - for stdin')
+    parser.add_argument('-o', '--output', default='-',
+                        help='output file, - for stdout')
+    parser.add_argument('-f', '--format', choices=sorted(WRITERS),
+                        default='jsonl')
+    parser.add_argument('-w', '--workers', type=int, default=MAX_WORKERS)
+    parser.add_argument('-k', '--max-results', type=int, default=None,
+                        help='keep only the cheapest round-trip options')
+    args = parser.parse_args(argv)
+
+    newline = {'newline': ''} if sys.version_info[0] > 2 else {}
+    queries_file = (sys.stdin if args.queries == '-'
+                    else io.open(args.queries, encoding='utf-8'))
+    output = (sys.stdout if args.output == '-'
+              else open(args.output, 'w', **newline))
+    try:
+        results = iter_search_flights(read_queries(queries_file),
+                                      args.workers, args.max_results)
+        count = write_results(results, WRITERS[args.format](output))
+    finally:
+        if queries_file is not sys.stdin:
+            queries_file.close()
+        if output is not sys.stdout:
+            output.close()
+    print('{} queries done'.format(count), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
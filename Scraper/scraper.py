@@ -1,15 +1,40 @@
 """Module contains class Scraper and self test code"""
 
-from datetime import datetime
+from __future__ import print_function
+
+from collections import namedtuple
+import copy
+from datetime import datetime, timedelta
 from decimal import Decimal
+from itertools import islice
+from multiprocessing.pool import ThreadPool
+from operator import attrgetter, itemgetter
+import os
 import re
+import time
+# strptime imports this module lazily, which is not thread-safe in Python 2
+import _strptime  # pylint: disable=unused-import
 import requests
-from lxml import html
+from lxml import etree, html
+from airports import AirportIndex
+from fetch import FETCHER
+from flight import Flight
+from metrics import METRICS
+from pairing import cheapest_pairs, pair_flights
 
 
 URL = 'https://apps.penguin.bg/fly/quote3.aspx'
 AIRPORTS_URL = 'http://www.flybulgarien.dk/en/'
+# json snapshot of AIRPORT_INDEX for cold starts, only used if the
+# AIRPORTS_SNAPSHOT environment variable gives its path
+AIRPORTS_SNAPSHOT = os.environ.get('AIRPORTS_SNAPSHOT') or None
 DATAPARAMS = {'lang': 'en', 'paxcount': '1', 'infcount': ''}
+NOT_FOUND_MES = 'No available flights found.'
+LUGGAGE_MES = 'NO LUGGAGE INCLUDED IN THE PRICE'
+CHUNK_SIZE = 16 * 1024
+MAX_WORKERS = 8
+
+SearchResult = namedtuple('SearchResult', 'query scraper error')
 
 
 class DataError(Exception):
@@ -31,6 +56,9 @@ class Scraper(object):
     flight data from the site 'http://www.flybulgarien.dk/en/' which receives
     data from the site 'https://apps.penguin.bg/fly/quote3.aspx'"""
 
+    max_results = None  # number of cheapest round-trip options to keep
+    fare_store = None  # FareStore serving repeated requests
+
     def __init__(self, dep_code, arr_code, dep_date, rt_date=None):
 
         self.data_params = dict(DATAPARAMS)
@@ -43,7 +71,7 @@ class Scraper(object):
         else:
             self.data_params['ow'] = ''
         self.url = URL
-        self.airports_url = AIRPORTS_URL
+        self.airport_index = AIRPORT_INDEX
         self.flight_notfound_flag = False
         self.converted_flight_list = None
         self.result_flight_list = None
@@ -52,29 +80,15 @@ class Scraper(object):
     def get_response_text(url, parametres=''):
         """This function receives and returns a response from the site"""
 
-        response = requests.get(url, params=parametres)
-        response.raise_for_status()
+        response = FETCHER.get(url, parametres)
         return html.fromstring(response.text)
 
     def check_available_airports(self):
-        """This function get a list of available airports from the site and
-        checks the requested data on the list"""
-
-        parsed = Scraper.get_response_text(self.airports_url)
-        path = '/html/body/div/div/div/form/dl/dd/select/option/@value'
-        airports_list = parsed.xpath(path)
-        depature_airports_set = set(filter(None, airports_list))
-        if self.data_params['aptcode1'] not in depature_airports_set:
-            raise DataError('Requested airports '
-                            'are not available or do not exist\n')
-        arr_airports_url = (self.airports_url[:-3] + 'script/getcity/2-' +
-                            self.data_params['aptcode1'])
-        arrival_airports = Scraper.get_response_text(arr_airports_url)
-        arrival_airports = arrival_airports.xpath('text()')[0].split(',')
-        arrival_airports_list = []
-        for airport in arrival_airports:
-            arrival_airports_list.append(airport.strip('{}\n\t"')[:3])
-        if self.data_params['aptcode2'] not in arrival_airports_list:
+        """This function checks the requested airports on the lists of
+        available airports from the shared airport index"""
+
+        if not self.airport_index.has_route(self.data_params['aptcode1'],
+                                            self.data_params['aptcode2']):
             raise DataError('Requested airports '
                             'are not available or do not exist\n')
 
@@ -95,67 +109,135 @@ class Scraper(object):
             else:
                 raise DataError('Incorrect date format\n')
 
-    def parse_flights_table(self):
-        """This function finds and saves all the cells of the table with available
-        flights to the list, and also sets the flag "flight_notfound_flag"
-        in case finding the message 'No available flights found.'"""
+    @staticmethod
+    def get_response(url, parametres=''):
+        """This function sends a request and returns the response, whose
+        body is read later in chunks"""
 
-        parsed = Scraper.get_response_text(self.url, self.data_params)
-        path = '/html/body/form/div/table[@id="flywiz"]/tr/td/table/tr'
-        tr_elements_list = parsed.xpath(path)
-        tr_list = []
-        try:
-            for tr_element in tr_elements_list:
-                td_list = []
-                tr_list.append(td_list)
-                for t_d in tr_element.xpath('td/text()'):
-                    if 'No available flights found.' in t_d:
-                        raise FlightNotFound
-                    td_list.append(t_d.strip())
+        return FETCHER.stream(url, parametres)
+
+    @staticmethod
+    def is_flights_row(t_r):
+        """This function checks that the row element is a row of the inner
+        table of the table with available flights"""
 
-        except FlightNotFound:
-            self.flight_notfound_flag = True
+        ancestors = list(islice(t_r.iterancestors(), 4))
+        return ([element.tag for element in ancestors] ==
+                ['table', 'td', 'tr', 'table'] and
+                ancestors[3].get('id') == 'flywiz')
 
+    def parse_flights_table(self):
+        """This function reads the response in chunks and yields the cells
+        of every row of the table with available flights as soon as the row
+        is parsed, rows that are already read are removed from the tree.
+        It also sets the flag "flight_notfound_flag" and stops in case
+        finding the message 'No available flights found.'"""
+
+        response = Scraper.get_response(self.url, self.data_params)
+        parser = etree.HTMLPullParser(events=('end',), tag='tr',
+                                      encoding=response.encoding)
+        try:
+            for chunk in response.iter_content(CHUNK_SIZE):
+                with METRICS.timer('parse'):
+                    tr_list = self.read_flights_rows(parser, chunk)
+                METRICS.incr('rows_parsed', len(tr_list))
+                for td_list in tr_list:
+                    yield td_list
+                if self.flight_notfound_flag:
+                    return
+        finally:
+            response.close()
+
+    def read_flights_rows(self, parser, chunk):
+        """This function feeds the chunk of the response to the parser and
+        returns the cells of the rows of the table with available flights
+        which are parsed so far, then removes these rows from the tree"""
+
+        tr_list = []
+        parser.feed(chunk)
+        for _, tr_element in parser.read_events():
+            if not Scraper.is_flights_row(tr_element):
+                continue
+            td_list = []
+            for t_d in tr_element.xpath('td/text()'):
+                if NOT_FOUND_MES in t_d:
+                    self.flight_notfound_flag = True
+                    return tr_list
+                td_list.append(t_d.strip())
+            tr_element.clear()
+            while tr_element.getprevious() is not None:
+                del tr_element.getparent()[0]
+            tr_list.append(td_list)
         return tr_list
 
     @staticmethod
     def normalize_flights_list(row_lst):
-        """This function deletes all empty cells, cells with empty elements
+        """This function skips all empty cells, cells with empty elements
         and extra messages and also combines lines of two, so that one list
-        item corresponds to one flight"""
-
-        tr_list = [tr for tr in row_lst if tr and all(tr)]
-        tr_list = [tr + tr_list[tr_list.index(tr) + 1] for tr in tr_list[::2]]
-        luggage_mes = 'NO LUGGAGE INCLUDED IN THE PRICE'
-        for i, t_r in enumerate(tr_list):
-            if luggage_mes in t_r:
-                tr_list[i].remove(luggage_mes)
-        return tr_list
+        item corresponds to one flight. Rows are taken one by one and the
+        flights are yielded as soon as they are combined"""
+
+        first_row = None
+        for t_r in row_lst:
+            if not t_r or not all(t_r):
+                continue
+            if first_row is None:
+                first_row = t_r
+                continue
+            flight = first_row + t_r
+            first_row = None
+            if LUGGAGE_MES in flight:
+                flight.remove(LUGGAGE_MES)
+            yield flight
 
     def get_flights_list(self):
-        """This function gets and returns flight list"""
+        """This function returns the generator of the flight list"""
 
         return Scraper.normalize_flights_list(self.parse_flights_table())
 
-    def sort_flights_list(self, flights_lst):
+    def get_query_dates(self):
+        """This function returns the requested departure and return dates
+        as datetime objects, the return date is None for one way flights"""
+
+        depdate = datetime.strptime(self.data_params['depdate'], '%d.%m.%Y')
+        if 'rtdate' in self.data_params:
+            rtdate = datetime.strptime(self.data_params['rtdate'], '%d.%m.%Y')
+        else:
+            rtdate = None
+        return depdate, rtdate
+
+    @staticmethod
+    def convert_flight(flight, date):
+        """This function converts the row of the flight table to Flight,
+        date is the already parsed date of the flight"""
+
+        departure, arrival = (date.replace(hour=int(flight_time[:2]),
+                                           minute=int(flight_time[3:]))
+                              for flight_time in (flight[1], flight[2]))
+        if arrival.time() < departure.time():
+            arrival += timedelta(days=1)
+        price = flight[5].split()
+        return Flight(flight[3], flight[4], departure, arrival,
+                      Decimal(price[1]), price[2])
+
+    def convert_flights_list(self, flights_lst):
         """This function converts string data to date objects for date
-        and decimal format for money and saves this list in class attribute.
-        Then it trying to find all the options for round-trip flights and
-        saves them in the second list """
+        and decimal format for money and returns the list of Flight for the
+        requested airports and dates"""
 
         converted_flight_list = []
-        result_flight_list = []
+        depdate, rtdate = self.get_query_dates()
+        dates = {}  # the table has few dates, so each is parsed only once
+        # rows come lazily from the parser, so only the conversion is timed
+        convert_time = 0.0
 
         for flight in flights_lst:
-            date = datetime.strptime(flight[0].split(',')[1].strip(),
-                                     '%d %b %y')
-            depdate = datetime.strptime(self.data_params['depdate'],
-                                        '%d.%m.%Y')
-            if 'rtdate' in self.data_params:
-                rtdate = datetime.strptime(self.data_params['rtdate'],
-                                           '%d.%m.%Y')
-            else:
-                rtdate = None
+            start = time.time()
+            date_str = flight[0].split(',')[1].strip()
+            date = dates.get(date_str)
+            if date is None:
+                date = dates[date_str] = datetime.strptime(date_str,
+                                                           '%d %b %y')
 
             is_dep_data_correct = (date == depdate and
                                    self.data_params['aptcode1'] in flight[3]
@@ -164,28 +246,58 @@ class Scraper(object):
                                   self.data_params['aptcode2'] in flight[3]
                                   and self.data_params['aptcode1'] in flight[4])
             if is_dep_data_correct or is_rt_data_correct:
+                converted_flight_list.append(Scraper.convert_flight(flight,
+                                                                    date))
+            convert_time += time.time() - start
+        METRICS.observe('convert', convert_time)
+        METRICS.incr('flights_converted', len(converted_flight_list))
+        return converted_flight_list
+
+    def pair_flights_list(self, converted_flight_list):
+        """This function saves the converted flights in class attribute and
+        finds all the options for round-trip flights, or only max_results
+        cheapest of them, and saves them in the second list"""
 
-                for flight_time in (flight[1], flight[2]):
-                    date = date.replace(hour=int(flight_time[:2]),
-                                        minute=int(flight_time[3:]))
-                    flight.append(date)
-                if flight[-1].time() < flight[-2].time():
-                    flight[-1] = flight[-1].replace(day=(flight[-1].day + 1))
-                flight[5] = flight[5].split()[1:]
-                flight[5][0] = Decimal(flight[5][0])
-                del flight[:3]  # deleting old format data from flight the list
-                converted_flight_list.append(flight)
         self.converted_flight_list = converted_flight_list
+        outbound = [flight for flight in converted_flight_list
+                    if self.data_params['aptcode1'] in flight.origin]
+        inbound = [flight for flight in converted_flight_list
+                   if self.data_params['aptcode2'] in flight.origin]
+        with METRICS.timer('pairing'):
+            if self.max_results is None:
+                self.result_flight_list = list(pair_flights(outbound,
+                                                            inbound))
+            else:
+                self.result_flight_list = list(cheapest_pairs(
+                    outbound, inbound, self.max_results))
+
+    def sort_flights_list(self, flights_lst):
+        """This function converts string data to date objects for date
+        and decimal format for money and saves this list in class attribute.
+        Then it trying to find all the options for round-trip flights, or
+        only max_results cheapest of them, and saves them in the second
+        list """
 
-        for i, flight in enumerate(converted_flight_list):
-            if self.data_params['aptcode1'] in flight[0]:
-                for flight2 in converted_flight_list[i + 1:]:
-                    if (self.data_params['aptcode2'] in flight2[0]
-                            and flight2[3] > flight[3]):
-                        result_flight = (flight, flight2, flight[2][0]
-                                         + flight2[2][0])
-                        result_flight_list.append(result_flight)
-        self.result_flight_list = result_flight_list
+        self.pair_flights_list(self.convert_flights_list(flights_lst))
+
+    def fetch_flights_list(self):
+        """This function gets the flight table from the site and returns the
+        list of converted flights"""
+
+        return self.convert_flights_list(self.get_flights_list())
+
+    def load_flights_list(self):
+        """This function returns the list of converted flights from the fare
+        store if it is set and has a fresh enough snapshot, otherwise gets it
+        from the site"""
+
+        if self.fare_store is None:
+            return self.fetch_flights_list()
+        # the background refresh works on a copy, so it does not change
+        # the flags of this search
+        return self.fare_store.load(self.data_params,
+                                    self.fetch_flights_list,
+                                    copy.copy(self).fetch_flights_list)
 
     @staticmethod
     def print_flight(dep_airport, dep_time, arr_airport,
@@ -199,46 +311,137 @@ class Scraper(object):
                                             arr_time.strftime('%a, %d %B %Y, %H:%M'),
                                             str(flight_dur)[:-3]))
 
+    def find_flights(self):
+        """This function calls other functions for building flight list and
+        raises FlightNotFound if flights are missing in at least one
+        direction, the found flights are kept in the class attributes"""
+
+        with METRICS.timer('search'):
+            self.check_available_airports()
+            self.check_date_format()
+            self.pair_flights_list(self.load_flights_list())
+
+        if 'rtdate' not in self.data_params:
+            if not self.converted_flight_list or self.flight_notfound_flag:
+                raise FlightNotFound('No available flights found!\n')
+        elif (self.converted_flight_list and
+              not self.result_flight_list):
+            raise FlightNotFound('Flights found only in one direction:\n')
+        elif not self.converted_flight_list:
+            raise FlightNotFound('No available flights found!\n')
+
+    def get_sorted_round_trips(self):
+        """This function returns the found round-trip options sorted by
+        total cost"""
+
+        return sorted(self.result_flight_list or [], key=itemgetter(2))
+
+    def get_sorted_flights(self):
+        """This function returns the found flights sorted by price"""
+
+        return sorted(self.converted_flight_list or [],
+                      key=attrgetter('price'))
+
+    def print_found_flights(self):
+        """This function displays all found flight options in sorted order"""
+
+        if self.result_flight_list:
+            for flight in self.get_sorted_round_trips():
+                for i in range(2):
+                    Scraper.print_flight(flight[i].origin,
+                                         flight[i].departure,
+                                         flight[i].destination,
+                                         flight[i].arrival,
+                                         flight[i].duration)
+                print("Total cost: {} {}\n".format(flight[-1],
+                                                   flight[0].currency))
+        elif self.converted_flight_list:
+            for flight in self.get_sorted_flights():
+                Scraper.print_flight(flight.origin, flight.departure,
+                                     flight.destination, flight.arrival,
+                                     flight.duration)
+                print("Total cost: {} {}\n".format(flight.price,
+                                                   flight.currency))
+
+    def search(self):
+        """This function builds flight list and returns the error which
+        stopped the search or None, the errors are classified the same way
+        as they are printed by print_flights"""
+
+        try:
+            self.find_flights()
+        except (requests.exceptions.RequestException, DataError,
+                FlightNotFound) as exp:
+            return exp
+        return None
+
     def print_flights(self):
         """This function calls other functions for building flight list,
         displays all found flight options in sorted order, and
         handles arising errors """
 
+        print_search_result(SearchResult(None, self, self.search()))
+
+
+AIRPORT_INDEX = AirportIndex(AIRPORTS_URL, Scraper.get_response_text,
+                             snapshot_path=AIRPORTS_SNAPSHOT)
+
+
+def iter_search_flights(queries, max_workers=MAX_WORKERS, max_results=None,
+                        fare_store=None, make_scraper=Scraper):
+    """This function runs the search for every query of the iterable
+    concurrently in a bounded thread pool and yields SearchResult in the
+    order of the queries as soon as they are ready. Queries are taken in
+    small batches, so only a few of them are held in memory at once.
+    Queries with incorrect number of parameters get TypeError as the error.
+    If max_results is given only that many cheapest round-trip options are
+    kept for every query, if fare_store is given the flights are served
+    from it when possible. Scrapers are built by make_scraper(*query)"""
+
+    def run(query):
         try:
-            self.check_available_airports()
-            self.check_date_format()
-            self.sort_flights_list(self.get_flights_list())
-
-            if 'rtdate' not in self.data_params:
-                if (not self.converted_flight_list
-                        or self.flight_notfound_flag):
-                    print "No available flights found!\n"
-            elif (self.converted_flight_list and
-                  not self.result_flight_list):
-                print "Flights found only in one direction:\n"
-            elif not self.converted_flight_list:
-                print "No available flights found!\n"
-
-            if self.result_flight_list:
-                for flight in sorted(self.result_flight_list,
-                                     key=lambda x: x[-1]):
-                    for i in range(2):
-                        Scraper.print_flight(flight[i][0], flight[i][3],
-                                             flight[i][1], flight[i][4],
-                                             flight[i][4] - flight[i][3])
-                    print "Total cost: {} {}\n".format(flight[-1],
-                                                       flight[0][2][1])
-            elif self.converted_flight_list:
-                for flight in sorted(self.converted_flight_list,
-                                     key=lambda x: x[2][0]):
-                    Scraper.print_flight(flight[0], flight[3], flight[1],
-                                         flight[4], flight[4] - flight[3])
-                    print "Total cost: {} {}\n".format(flight[2][0],
-                                                       flight[2][1])
-        except requests.exceptions.RequestException as exp:
-            print exp
-        except DataError as exp:
-            print exp
+            scraper = make_scraper(*query)
+        except TypeError as exp:
+            return SearchResult(query, None, exp)
+        scraper.max_results = max_results
+        scraper.fare_store = fare_store
+        return SearchResult(query, scraper, scraper.search())
+
+    queries = iter(queries)
+    pool = ThreadPool(max_workers)
+    try:
+        while True:
+            batch = list(islice(queries, max_workers * 4))
+            if not batch:
+                break
+            for result in pool.imap(run, batch):
+                yield result
+    finally:
+        pool.close()
+        pool.join()
+
+
+def search_flights(queries, max_workers=MAX_WORKERS, max_results=None,
+                   fare_store=None, make_scraper=Scraper):
+    """This function runs the search for every query of the list
+    concurrently in a bounded thread pool and returns the list of
+    SearchResult in the order of the queries, see iter_search_flights"""
+
+    return list(iter_search_flights(queries, max_workers, max_results,
+                                    fare_store, make_scraper))
+
+
+def print_search_result(result):
+    """This function prints the search result the way print_flights does"""
+
+    if isinstance(result.error, TypeError):
+        print('You entered incorrect number of parameters, try again!\n')
+        return
+    if result.error:
+        print(result.error)
+    if not isinstance(result.error, (requests.exceptions.RequestException,
+                                     DataError)):
+        result.scraper.print_found_flights()
 
 
 if __name__ == '__main__':
@@ -253,10 +456,6 @@ if __name__ == '__main__':
                     ['BOJ', 'BLL', '22.07.2019', '23.07.2019'],
                     ['BOJ', 'BLL', '22.07.2019', '29.07.2019', '30.08.2019']]
 
-    for flight_data in FLIGHTS_DATA:
-        try:
-            Scraper(*flight_data).print_flights()
-            print "-" * 40 + '\n'
-        except TypeError:
-            print 'You entered incorrect number of parameters, try again!\n'
-            print "-" * 40 + '\n'
+    for search_result in search_flights(FLIGHTS_DATA):
+        print_search_result(search_result)
+        print("-" * 40 + '\n')
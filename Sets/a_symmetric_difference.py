@@ -1,19 +1,10 @@
-def inp():
-    input_list = map(int,raw_input().split())
-    if  len(input_list) > 1:
-        return input_list
-    else:
-        return input_list[0]
+import sys
 
-n, set1, m, set2 = inp(), set(inp()), inp(), set(inp())
+from int_set import IntSet
 
-#print(len(set1.symmetric_difference(set2)))
+lines = iter(sys.stdin.readline, '')
+n, set1, m, set2 = (next(lines), IntSet.from_string(next(lines)),
+                    next(lines), IntSet.from_string(next(lines)))
 
-count = 0
-for i in set(list(set1)+list(set2)):
-    
-    if not (i in set1 and i in set2):
-        count+=1
-        
-
-print(count)
\ No newline at end of file
+# the size of the symmetric difference without building it
+print(set1.symmetric_difference_count(set2))
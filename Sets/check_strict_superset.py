@@ -1,12 +1,13 @@
+import sys
+
+from containment import ContainmentIndex, read_sets
+
 def is_A_superset_of_all_B_sets():
-    for i in range(N):
-        B = set(map(int, raw_input().split()))
-        if A>B:
-               continue
-        else:
-               return False
-    return True
+    # the B sets are read one by one until one of them is not inside A
+    return ContainmentIndex([A]).supersets_of_all(read_sets(lines, N),
+                                                  strict=True) == [0]
 
-A, N = set(map(int, raw_input().split())), input()
+lines = iter(sys.stdin.readline, '')
+A, N = frozenset(map(int, next(lines).split())), int(next(lines))
 
-print(is_A_superset_of_all_B_sets())
\ No newline at end of file
+print(is_A_superset_of_all_B_sets())
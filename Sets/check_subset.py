@@ -1,8 +1,14 @@
-T = input()
-for i in range(T):
-	n_A = input()
-	A = set(map(int, raw_input().split()))
-	n_B = input ()
-	B = set(map(int, raw_input().split()))
-	print (A<B)
+import sys
 
+from containment import read_sets
+
+def iter_answers(lines, T):
+    # every pair is read and answered in turn, the answers are written once
+    sets = read_sets(line for i, line in enumerate(lines) if i % 2)
+    for i in range(T):
+        A, B = next(sets), next(sets)
+        yield str(A<B)
+
+lines = iter(sys.stdin.readline, '')
+T = int(next(lines))
+sys.stdout.write('\n'.join(iter_answers(lines, T)) + '\n')
@@ -0,0 +1,118 @@
+"""Containment index for the check_subset and check_strict_superset tasks
+at scale.
+
+ContainmentIndex keeps an inverted index from every element to the numbers
+of the reference sets containing it, so a query set is compared only with
+the references sharing its elements instead of with all of them:
+
+- supersets(B): references containing B, the postings of the elements of
+  B are intersected rarest first and the search stops when nothing is left
+- subsets(B): references inside B, the elements of B are counted for every
+  reference sharing them, a reference is inside B if all its elements were
+  counted
+- supersets_of_all(Bs): references containing every B, the B sets are read
+  one by one and reading stops as soon as no reference is left
+
+The query sets can be any iterable of ints, read_sets streams them from
+lines of input.
+"""
+from collections import Counter
+from itertools import chain, islice
+
+EMPTY = frozenset()
+
+
+def read_sets(lines, count=None):
+    # sets of ints from the lines, the first count of them if count is given
+    if count is not None:
+        lines = islice(lines, count)
+    for line in lines:
+        yield frozenset(map(int, line.split()))
+
+
+class ContainmentIndex(object):
+
+    def __init__(self, references):
+        self.sizes = []
+        postings = {}
+        for number, reference in enumerate(references):
+            reference = frozenset(reference)
+            self.sizes.append(len(reference))
+            for element in reference:
+                posting = postings.get(element)
+                if posting is None:
+                    posting = postings[element] = []
+                posting.append(number)
+        self.postings = dict((element, frozenset(posting))
+                             for element, posting in postings.items())
+        self.all = frozenset(range(len(self.sizes)))
+        self.empty = frozenset(number for number, size
+                               in enumerate(self.sizes) if not size)
+
+    def __len__(self):
+        return len(self.sizes)
+
+    def get_supersets(self, query):
+        # frozenset of the numbers of the references containing query
+        postings = []
+        for element in query:
+            posting = self.postings.get(element)
+            if posting is None:
+                return EMPTY
+            postings.append(posting)
+        if not postings:
+            return self.all
+        postings.sort(key=len)
+        found = postings[0]
+        for posting in islice(postings, 1, None):
+            found = found & posting
+            if not found:
+                break
+        return found
+
+    def supersets(self, query, strict=False):
+        query = frozenset(query)
+        found = self.get_supersets(query)
+        if strict:
+            return sorted(number for number in found
+                          if self.sizes[number] > len(query))
+        return sorted(found)
+
+    def subsets(self, query, strict=False):
+        query = frozenset(query)
+        postings = self.postings
+        counts = Counter(chain.from_iterable(
+            postings[element] for element in query if element in postings))
+        sizes = self.sizes
+        found = [number for number, count in counts.items()
+                 if count == sizes[number]]
+        found.extend(self.empty)
+        if strict:
+            return sorted(number for number in found
+                          if sizes[number] < len(query))
+        return sorted(found)
+
+    def supersets_of_all(self, queries, strict=False):
+        # numbers of the references containing every query set, queries is
+        # read only until no reference is left
+        found = self.all
+        for query in queries:
+            query = frozenset(query)
+            supersets = self.get_supersets(query)
+            if strict:
+                supersets = frozenset(number for number in supersets
+                                      if self.sizes[number] > len(query))
+            found = found & supersets
+            if not found:
+                break
+        return sorted(found)
+
+    def iter_supersets(self, queries, strict=False):
+        # bulk query, the list of references containing every query set
+        for query in queries:
+            yield self.supersets(query, strict)
+
+    def iter_subsets(self, queries, strict=False):
+        # bulk query, the list of references inside every query set
+        for query in queries:
+            yield self.subsets(query, strict)
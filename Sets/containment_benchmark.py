@@ -0,0 +1,71 @@
+from __future__ import print_function
+
+import random
+import sys
+import timeit
+
+from containment import ContainmentIndex
+
+REFERENCES = 10**3
+CANDIDATES = 10**4
+UNIVERSE = 10**4
+PAIRWISE_LIMIT = 10**8  # comparisons, the loop takes minutes above it
+
+
+def make_sets(count, low, high, rand):
+    return [frozenset(rand.sample(range(UNIVERSE), rand.randint(low, high)))
+            for _ in range(count)]
+
+
+def make_candidates(references, count, rand):
+    # half of them are taken from a reference, so there is something to find
+    candidates = []
+    for _ in range(count):
+        if rand.random() < 0.5:
+            reference = sorted(rand.choice(references))
+            candidates.append(frozenset(rand.sample(
+                reference, min(len(reference), rand.randint(1, 5)))))
+        else:
+            candidates.append(frozenset(rand.sample(range(UNIVERSE),
+                                                    rand.randint(1, 5))))
+    return candidates
+
+
+def pairwise_supersets(references, candidates):
+    # the pairwise loop of the scripts, for comparison
+    return [[number for number, reference in enumerate(references)
+             if candidate <= reference] for candidate in candidates]
+
+
+def measure(name, function, count):
+    seconds = timeit.timeit(function, number=1)
+    print('%-40s %10.3f s %12.0f /s' % (name, seconds, count / seconds))
+
+
+if __name__ == '__main__':
+    references_count, candidates_count = ([int(arg) for arg in sys.argv[1:3]]
+                                          or [REFERENCES, CANDIDATES])
+    rand = random.Random(0)
+    references = make_sets(references_count, 50, 500, rand)
+    candidates = make_candidates(references, candidates_count, rand)
+    print('%d candidates, %d references' % (candidates_count,
+                                            references_count))
+    measure('build index', lambda: ContainmentIndex(references),
+            references_count)
+    index = ContainmentIndex(references)
+    assert (list(index.iter_supersets(candidates[:100])) ==
+            pairwise_supersets(references, candidates[:100]))
+    if references_count * candidates_count <= PAIRWISE_LIMIT:
+        measure('pairwise <=', lambda: pairwise_supersets(references,
+                                                          candidates),
+                candidates_count)
+    measure('index supersets', lambda: list(index.iter_supersets(
+        candidates)), candidates_count)
+    measure('index subsets', lambda: list(index.iter_subsets(
+        references[:100])), 100)
+    measure('pairwise all B inside A', lambda: [
+        number for number, reference in enumerate(references)
+        if all(candidate < reference for candidate in candidates)],
+        candidates_count)
+    measure('index supersets_of_all', lambda: index.supersets_of_all(
+        candidates, strict=True), candidates_count)
@@ -0,0 +1,335 @@
+"""Compact set of integers for the Sets tasks at scale.
+
+IntSet keeps its elements as a sorted array of 8-byte integers or, when
+they are dense, as a bitmap of 1 bit per number of their range, so a set of
+tens of millions of ids takes megabytes instead of a Python set's
+gigabytes. The storage is chosen by density and chosen again for every
+result. The *_count methods return the size of a result without building
+it.
+
+Bitmaps need NumPy, without it the sorted array('q') storage and pure
+Python merging are used.
+"""
+from array import array
+from bisect import bisect_left
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    TYPECODE = array('q').typecode
+except ValueError:  # Python 2
+    TYPECODE = 'l'
+
+# a bitmap is used when it is smaller than the sorted array, that is when
+# the range of the numbers is less than 64 times their count
+BITMAP_RATIO = 64
+BITMAP_ALIGNMENT = 8  # the base of a bitmap is a multiple of 8
+MAX_DIGITS = 18  # longer numbers may not fit in int64
+if numpy is not None:
+    POPCOUNT = numpy.array([bin(i).count('1') for i in range(256)],
+                           dtype=numpy.uint8)
+    WHITESPACE = numpy.zeros(256, dtype=bool)
+    WHITESPACE[[ord(space) for space in ' \t\n\r\x0b\x0c']] = True
+
+
+class IntSet(object):
+    __slots__ = ('values', 'base', 'bits', 'size')
+
+    def __init__(self, values=()):
+        self.values = None  # sorted unique numbers
+        self.base = None  # the number of the first bit of the bitmap
+        self.bits = None  # numpy.packbits bitmap
+        if numpy is None:
+            self.values = array(TYPECODE, sorted(set(values)))
+            self.size = len(self.values)
+        else:
+            if not isinstance(values, numpy.ndarray):
+                values = numpy.fromiter(values, dtype=numpy.int64)
+            self.set_sorted(sort_unique(values.astype(numpy.int64)))
+
+    @classmethod
+    def from_string(cls, line):
+        # bulk parsing of a line of numbers separated by whitespace
+        if not line.strip():
+            return cls()
+        if numpy is None or not is_plain_ints(line):
+            # int() gives the same numbers and errors as before
+            return cls(list(map(int, line.split())))
+        return cls(numpy.fromstring(line, dtype=numpy.int64, sep=' '))
+
+    @classmethod
+    def from_sorted(cls, values):
+        int_set = cls.__new__(cls)
+        int_set.values = int_set.base = int_set.bits = None
+        if numpy is None:
+            int_set.values = values
+            int_set.size = len(values)
+        else:
+            int_set.set_sorted(values)
+        return int_set
+
+    @classmethod
+    def from_bitmap(cls, base, bits):
+        int_set = cls.__new__(cls)
+        int_set.values = int_set.base = int_set.bits = None
+        int_set.set_bitmap(base, bits)
+        return int_set
+
+    @property
+    def is_bitmap(self):
+        return self.bits is not None
+
+    @property
+    def nbytes(self):
+        if self.bits is not None:
+            return self.bits.nbytes
+        if numpy is None:
+            return self.values.itemsize * len(self.values)
+        return self.values.nbytes
+
+    def set_sorted(self, values):
+        self.size = len(values)
+        if self.size and values[-1] - values[0] < BITMAP_RATIO * self.size:
+            base = int(values[0]) - int(values[0]) % BITMAP_ALIGNMENT
+            flags = numpy.zeros(int(values[-1]) - base + 1, dtype=bool)
+            flags[values - base] = True
+            self.base, self.bits = base, numpy.packbits(flags)
+        else:
+            self.values = values
+
+    def set_bitmap(self, base, bits):
+        self.size = int(POPCOUNT[bits].sum(dtype=numpy.int64))
+        if self.size and len(bits) * 8 < BITMAP_RATIO * self.size:
+            self.base, self.bits = base, bits
+        else:
+            self.values = base + numpy.flatnonzero(
+                numpy.unpackbits(bits)).astype(numpy.int64)
+
+    def to_sorted(self):
+        if self.bits is None:
+            return self.values
+        return self.base + numpy.flatnonzero(
+            numpy.unpackbits(self.bits)).astype(numpy.int64)
+
+    def get_range(self):
+        # the first and the last number the storage can hold
+        if self.bits is not None:
+            return self.base, self.base + len(self.bits) * 8 - 1
+        return int(self.values[0]), int(self.values[-1])
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        return iter(self.to_sorted())
+
+    def __contains__(self, number):
+        if self.bits is not None:
+            i = number - self.base
+            return (0 <= i < len(self.bits) * 8 and
+                    bool(self.bits[i >> 3] & (128 >> (i & 7))))
+        values = self.values
+        if numpy is None:
+            i = bisect_left(values, number)
+        else:
+            i = int(numpy.searchsorted(values, number))
+        return i < len(values) and values[i] == number
+
+    def __repr__(self):
+        return 'IntSet(%s)' % [int(number) for number in self]
+
+    def get_bitmaps(self, other, whole=True):
+        # both sets as bitmaps with the same base over the range of both,
+        # or only over the range they share if not whole
+        first, last = self.get_range()
+        other_first, other_last = other.get_range()
+        if whole:
+            first, last = min(first, other_first), max(last, other_last)
+        else:
+            first, last = max(first, other_first), min(last, other_last)
+        base = first - first % BITMAP_ALIGNMENT
+        length = max(0, (last - base) // 8 + 1)
+        return (base, self.get_bitmap(base, length),
+                other.get_bitmap(base, length))
+
+    def get_bitmap(self, base, length):
+        bits = numpy.zeros(length, dtype=numpy.uint8)
+        if self.bits is not None:
+            start = (self.base - base) // 8
+            own = self.bits[max(0, -start):length - start]
+            bits[max(0, start):max(0, start) + len(own)] = own
+            return bits
+        values = self.values[(self.values >= base) &
+                             (self.values < base + length * 8)] - base
+        numpy.bitwise_or.at(bits, values >> 3,
+                            (128 >> (values & 7)).astype(numpy.uint8))
+        return bits
+
+    def use_bitmaps(self, other):
+        # bitmaps are used if one set is a bitmap and the range of both is
+        # dense enough for it
+        if self.bits is None and other.bits is None:
+            return False
+        first, last = self.get_range()
+        other_first, other_last = other.get_range()
+        span = max(last, other_last) - min(first, other_first) + 1
+        return span < BITMAP_RATIO * (self.size + other.size)
+
+    def combine(self, other, operation):
+        if not isinstance(other, IntSet):
+            other = IntSet(other)
+        if numpy is None:
+            return IntSet.from_sorted(array(TYPECODE, merge_sorted(
+                self.values, other.values, operation)))
+        if not self.size or not other.size:
+            return IntSet.from_sorted(numpy.asarray(
+                SORTED_OPERATIONS[operation](self.to_sorted(),
+                                             other.to_sorted()),
+                dtype=numpy.int64))
+        if self.use_bitmaps(other):
+            base, bits, other_bits = self.get_bitmaps(other)
+            return IntSet.from_bitmap(base, BITMAP_OPERATIONS[operation](
+                bits, other_bits))
+        return IntSet.from_sorted(SORTED_OPERATIONS[operation](
+            self.to_sorted(), other.to_sorted()))
+
+    def union(self, other):
+        return self.combine(other, 'union')
+
+    def intersection(self, other):
+        return self.combine(other, 'intersection')
+
+    def difference(self, other):
+        return self.combine(other, 'difference')
+
+    def symmetric_difference(self, other):
+        return self.combine(other, 'symmetric_difference')
+
+    __or__ = union
+    __and__ = intersection
+    __sub__ = difference
+    __xor__ = symmetric_difference
+
+    def intersection_count(self, other):
+        if not isinstance(other, IntSet):
+            other = IntSet(other)
+        if not self.size or not other.size:
+            return 0
+        if numpy is None:
+            return sum(1 for _ in merge_sorted(self.values, other.values,
+                                               'intersection'))
+        if self.use_bitmaps(other):
+            _, bits, other_bits = self.get_bitmaps(other, whole=False)
+            return int(POPCOUNT[bits & other_bits].sum(dtype=numpy.int64))
+        small, big = sorted((self.to_sorted(), other.to_sorted()), key=len)
+        found = numpy.searchsorted(big, small)
+        found[found == len(big)] = 0
+        return int(numpy.count_nonzero(big[found] == small))
+
+    def union_count(self, other):
+        if not isinstance(other, IntSet):
+            other = IntSet(other)
+        return self.size + other.size - self.intersection_count(other)
+
+    def difference_count(self, other):
+        return self.size - self.intersection_count(other)
+
+    def symmetric_difference_count(self, other):
+        if not isinstance(other, IntSet):
+            other = IntSet(other)
+        return self.size + other.size - 2 * self.intersection_count(other)
+
+
+def is_plain_ints(line):
+    # True if the line has only integers of up to MAX_DIGITS digits
+    # separated by whitespace, which numpy.fromstring parses exactly, it
+    # stops at other tokens or saturates long numbers without an error
+    if not isinstance(line, bytes):
+        try:
+            line = line.encode('ascii')
+        except UnicodeEncodeError:
+            return False
+    data = numpy.frombuffer(line, dtype=numpy.uint8)
+    is_space = WHITESPACE[data]
+    is_digit = (data >= ord('0')) & (data <= ord('9'))
+    is_sign = (data == ord('+')) | (data == ord('-'))
+    if not numpy.all(is_space | is_digit | is_sign):
+        return False
+    # a sign starts a token and is followed by a digit
+    follows_space = numpy.ones(len(data), dtype=bool)
+    follows_space[1:] = is_space[:-1]
+    before_digit = numpy.zeros(len(data), dtype=bool)
+    before_digit[:-1] = is_digit[1:]
+    if numpy.any(is_sign & ~(follows_space & before_digit)):
+        return False
+    starts = numpy.flatnonzero(~is_space & follows_space)
+    ends = numpy.flatnonzero(is_space[1:] & ~is_space[:-1]) + 1
+    if len(ends) < len(starts):
+        ends = numpy.append(ends, len(data))
+    return not numpy.any(ends - starts - is_sign[starts] > MAX_DIGITS)
+
+
+def sort_unique(values):
+    # numpy.unique, which is much slower than sorting in some versions
+    values = numpy.sort(values)
+    if len(values) < 2:
+        return values
+    keep = numpy.empty(len(values), dtype=bool)
+    keep[0] = True
+    numpy.not_equal(values[1:], values[:-1], out=keep[1:])
+    return values[keep]
+
+
+def merge_sorted(values, other_values, operation):
+    # numbers of the operation result from two sorted arrays, in order
+    keep_first, keep_both, keep_second = MERGE_OPERATIONS[operation]
+    i = j = 0
+    while i < len(values) and j < len(other_values):
+        if values[i] < other_values[j]:
+            if keep_first:
+                yield values[i]
+            i += 1
+        elif values[i] > other_values[j]:
+            if keep_second:
+                yield other_values[j]
+            j += 1
+        else:
+            if keep_both:
+                yield values[i]
+            i += 1
+            j += 1
+    if keep_first:
+        for k in range(i, len(values)):
+            yield values[k]
+    if keep_second:
+        for k in range(j, len(other_values)):
+            yield other_values[k]
+
+
+
+# what is kept of the numbers of the first set only, of both sets and of
+# the second set only
+MERGE_OPERATIONS = {
+    'union': (True, True, True),
+    'intersection': (False, True, False),
+    'difference': (True, False, False),
+    'symmetric_difference': (True, False, True),
+}
+if numpy is not None:
+    SORTED_OPERATIONS = {
+        'union': lambda a, b: sort_unique(numpy.concatenate((a, b))),
+        'intersection': lambda a, b: numpy.intersect1d(a, b,
+                                                       assume_unique=True),
+        'difference': lambda a, b: numpy.setdiff1d(a, b, assume_unique=True),
+        'symmetric_difference': lambda a, b: numpy.setxor1d(
+            a, b, assume_unique=True),
+    }
+    BITMAP_OPERATIONS = {
+        'union': numpy.bitwise_or,
+        'intersection': numpy.bitwise_and,
+        'difference': lambda a, b: a & ~b,
+        'symmetric_difference': numpy.bitwise_xor,
+    }
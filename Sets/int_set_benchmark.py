@@ -0,0 +1,51 @@
+from __future__ import print_function
+
+import random
+import sys
+import timeit
+
+from int_set import IntSet
+
+SIZES = [10**6, 10**7]
+OPERATIONS = ['union', 'intersection', 'difference', 'symmetric_difference']
+
+
+def make_line(count, spread, rand):
+    return ' '.join(str(rand.randint(0, spread)) for _ in range(count))
+
+
+def measure(name, function):
+    seconds = timeit.timeit(function, number=1)
+    print('%-40s %10.3f s' % (name, seconds))
+
+
+def python_set_bytes(s):
+    # the table of the set and the int objects in it
+    return sys.getsizeof(s) + sum(sys.getsizeof(number) for number in s)
+
+
+def bench(count, spread, rand):
+    print('%d numbers of 0..%d' % (count, spread))
+    line, other_line = make_line(count, spread, rand), make_line(count,
+                                                                 spread, rand)
+    measure('set(map(int, ...))', lambda: set(map(int, line.split())))
+    measure('IntSet.from_string', lambda: IntSet.from_string(line))
+    a, b = set(map(int, line.split())), set(map(int, other_line.split()))
+    A, B = IntSet.from_string(line), IntSet.from_string(other_line)
+    print('%-40s %10.1f MB' % ('set memory', python_set_bytes(a) / 1e6))
+    print('%-40s %10.1f MB %s' % ('IntSet memory', A.nbytes / 1e6,
+                                  'bitmap' if A.is_bitmap else 'sorted'))
+    for operation in OPERATIONS:
+        measure('set ' + operation,
+                lambda: len(getattr(a, operation)(b)))
+        measure('IntSet ' + operation,
+                lambda: len(getattr(A, operation)(B)))
+        measure('IntSet %s_count' % operation,
+                lambda: getattr(A, operation + '_count')(B))
+
+
+if __name__ == '__main__':
+    for size in [int(arg) for arg in sys.argv[1:]] or SIZES:
+        rand = random.Random(size)
+        bench(size, size * 2, rand)  # dense ids, bitmaps
+        bench(size, 10**12, rand)  # sparse ids, sorted arrays
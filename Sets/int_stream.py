@@ -0,0 +1,86 @@
+"""Chunked reading of big lines of integers for the Sets tasks.
+
+TokenReader reads a binary stream in chunks of chunk_size bytes and gives
+every line as chunks cut on whitespace, so a line of 10^8 numbers is parsed
+piece by piece and never held in memory at once.
+"""
+import sys
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+CHUNK_SIZE = 1024 * 1024
+WHITESPACE = (b' ', b'\t', b'\r')
+
+
+class TokenReader(object):
+
+    def __init__(self, stream, chunk_size=CHUNK_SIZE):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buffer = b''
+
+    def iter_line_chunks(self):
+        # pieces of the current line which do not cut numbers, the line end
+        # is consumed
+        while True:
+            end = self.buffer.find(b'\n')
+            if end != -1:
+                chunk, self.buffer = self.buffer[:end], self.buffer[end + 1:]
+                yield chunk
+                return
+            data = self.stream.read(self.chunk_size)
+            if not data:
+                chunk, self.buffer = self.buffer, b''
+                yield chunk
+                return
+            data = self.buffer + data
+            if b'\n' in data:
+                self.buffer = data
+                continue
+            cut = max(data.rfind(space) for space in WHITESPACE)
+            self.buffer = data[cut + 1:]
+            if cut != -1:
+                yield data[:cut]
+
+    def iter_int_chunks(self):
+        # lists of the numbers of the current line
+        for chunk in self.iter_line_chunks():
+            numbers = list(map(int, chunk.split()))
+            if numbers:
+                yield numbers
+
+    def iter_array_chunks(self):
+        # numpy arrays of the numbers of the current line
+        for chunk in self.iter_line_chunks():
+            if chunk.strip():
+                yield numpy.fromstring(chunk, dtype=numpy.int64, sep=' ')
+
+    def read_ints(self):
+        # all the numbers of a short line
+        return [number for numbers in self.iter_int_chunks()
+                for number in numbers]
+
+    def skip_line(self):
+        for _ in self.iter_line_chunks():
+            pass
+
+    def seekable(self):
+        try:
+            self.stream.tell()
+        except (IOError, OSError, AttributeError):
+            return False
+        return getattr(self.stream, 'seekable', lambda: True)()
+
+    def tell(self):
+        return self.stream.tell() - len(self.buffer)
+
+    def seek(self, position):
+        self.stream.seek(position)
+        self.buffer = b''
+
+
+def stdin_reader(chunk_size=CHUNK_SIZE):
+    return TokenReader(getattr(sys.stdin, 'buffer', sys.stdin), chunk_size)
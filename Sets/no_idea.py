@@ -1,18 +1,56 @@
-def inp():
-    return map(int, raw_input().split())
+from itertools import repeat
+try:
+    from itertools import imap
+except ImportError:
+    imap = map
 
-if __name__ == '__main__':
-    n, m = inp()
-    arr = inp()
-    A = set(inp())
-    B = set(inp())
+from int_stream import stdin_reader
+
+def make_weights(A, B):
+    # one lookup for every number: +1 for A, -1 for B, 0 for both, A and B
+    # are sets so repeated numbers count once
+    weights = {}
+    for numbers in A:
+        weights.update(dict.fromkeys(numbers, 1))
+    B_set = set()
+    for numbers in B:
+        B_set.update(numbers)
+    for i in B_set:
+        weights[i] = weights.get(i, 0) - 1
+    return weights
 
+def score(chunks, weights):
+    get = weights.get
     happiness = 0
-    for i in arr:
-        if i in A:
-            happiness +=1
-        if i in B:
-            happiness -=1
+    for numbers in chunks:
+        happiness += sum(imap(get, numbers, repeat(0)))
+    return happiness
 
-    print(happiness)
+def score_counts(chunks, A, B):
+    # for streams which cannot be read twice, the numbers of arr are
+    # counted before A and B are known
+    counts = {}
+    get = counts.get
+    for numbers in chunks:
+        for i in numbers:
+            counts[i] = get(i, 0) + 1
+    weights = make_weights(A, B)
+    return sum(count * weights.get(i, 0) for i, count in counts.items())
 
+if __name__ == '__main__':
+    reader = stdin_reader()
+    n, m = reader.read_ints()
+    if reader.seekable():
+        # arr is skipped, scored after A and B with O(1) memory for it
+        start = reader.tell()
+        reader.skip_line()
+        weights = make_weights(reader.iter_int_chunks(),
+                               reader.iter_int_chunks())
+        reader.seek(start)
+        happiness = score(reader.iter_int_chunks(), weights)
+    else:
+        happiness = score_counts(reader.iter_int_chunks(),
+                                 reader.iter_int_chunks(),
+                                 reader.iter_int_chunks())
+
+    print(happiness)
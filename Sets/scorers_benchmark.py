@@ -0,0 +1,127 @@
+from __future__ import print_function
+
+import io
+import os
+import random
+import sys
+import tempfile
+import timeit
+
+from int_stream import TokenReader, numpy
+from no_idea import make_weights, score, score_counts
+from the_captions_room import find_captain, find_captain_numpy
+
+SIZES = [10**6, 10**7]
+K = 5
+
+
+def write_captain_input(path, count, rand):
+    rooms = list(range(1, count // K + 2))
+    rand.shuffle(rooms)
+    with io.open(path, 'w') as output:
+        output.write(u'%d\n' % K)
+        for room in rooms[1:]:
+            output.write(u' '.join([u'%d' % room] * K) + u' ')
+        output.write(u'%d\n' % rooms[0])
+    return rooms[0]
+
+
+def write_happiness_input(path, count, rand):
+    with io.open(path, 'w') as output:
+        output.write(u'%d %d\n' % (count, 1000))
+        for start in range(0, count, 10**5):
+            output.write(u' '.join(u'%d' % rand.randint(1, 10**4) for _
+                                   in range(min(10**5, count - start))))
+            output.write(u' ' if start + 10**5 < count else u'\n')
+        for numbers in (range(1, 2001, 2), range(2, 2002, 2)):
+            output.write(u' '.join(u'%d' % i for i in numbers) + u'\n')
+
+
+def captain_lists(path):
+    # the previous list and set based version, for comparison
+    with io.open(path) as lines:
+        K = int(lines.readline())
+        rooms_arr = list(map(int, lines.readline().split()))
+    return (sum(set(rooms_arr)) * K - sum(rooms_arr)) // (K - 1)
+
+
+def captain_stream(path, use_numpy=False):
+    with io.open(path, 'rb') as stream:
+        reader = TokenReader(stream)
+        K = reader.read_ints()[0]
+        if use_numpy:
+            return find_captain_numpy(reader.iter_array_chunks(), K)
+        return find_captain(reader.iter_int_chunks(), K)
+
+
+def happiness_lists(path):
+    # the previous list based version, for comparison
+    with io.open(path) as lines:
+        lines.readline()
+        arr = list(map(int, lines.readline().split()))
+        A = set(map(int, lines.readline().split()))
+        B = set(map(int, lines.readline().split()))
+    happiness = 0
+    for i in arr:
+        if i in A:
+            happiness += 1
+        if i in B:
+            happiness -= 1
+    return happiness
+
+
+def happiness_stream(path):
+    with io.open(path, 'rb') as stream:
+        reader = TokenReader(stream)
+        reader.read_ints()
+        start = reader.tell()
+        reader.skip_line()
+        weights = make_weights(reader.iter_int_chunks(),
+                               reader.iter_int_chunks())
+        reader.seek(start)
+        return score(reader.iter_int_chunks(), weights)
+
+
+def check_happiness(path, rand):
+    # repeated numbers and numbers in both A and B, against the lists
+    with io.open(path, 'w') as output:
+        output.write(u'%d %d\n' % (1000, 300))
+        for count in (1000, 300, 300):
+            output.write(u' '.join(u'%d' % rand.randint(1, 50) for _
+                                   in range(count)) + u'\n')
+    with io.open(path, 'rb') as stream:
+        reader = TokenReader(stream)
+        reader.read_ints()
+        counted = score_counts(reader.iter_int_chunks(),
+                               reader.iter_int_chunks(),
+                               reader.iter_int_chunks())
+    assert happiness_lists(path) == happiness_stream(path) == counted
+
+
+def measure(name, function, count):
+    results = []
+    seconds = timeit.timeit(lambda: results.append(function()), number=1)
+    print('%-40s %10.2f s %12.0f tokens/s  %s' % (name, seconds,
+                                                  count / seconds,
+                                                  results[0]))
+
+
+if __name__ == '__main__':
+    fd, path = tempfile.mkstemp()
+    os.close(fd)
+    try:
+        check_happiness(path, random.Random(0))
+        for size in [int(arg) for arg in sys.argv[1:]] or SIZES:
+            rand = random.Random(size)
+            print('%d tokens' % size)
+            write_captain_input(path, size, rand)
+            measure('captain, lists', lambda: captain_lists(path), size)
+            measure('captain, stream', lambda: captain_stream(path), size)
+            if numpy is not None:
+                measure('captain, stream numpy',
+                        lambda: captain_stream(path, True), size)
+            write_happiness_input(path, size, rand)
+            measure('happiness, lists', lambda: happiness_lists(path), size)
+            measure('happiness, stream', lambda: happiness_stream(path), size)
+    finally:
+        os.remove(path)
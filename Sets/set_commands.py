@@ -0,0 +1,72 @@
+"""Set command engine for the set_mutations and set_discard_remove_pop
+tasks.
+
+The command stream is parsed once into (name, operand) pairs, runs of the
+same command are merged into one call and every call goes through a table
+of bound methods of the set, so only whitelisted commands can be run.
+remove of a missing element and pop from an empty set raise KeyError as the
+methods of set do.
+"""
+from functools import reduce
+from itertools import groupby, islice
+from operator import itemgetter, xor
+
+MUTATIONS = frozenset(['update', 'intersection_update', 'difference_update',
+                       'symmetric_difference_update'])
+ELEMENT_COMMANDS = frozenset(['add', 'discard', 'remove', 'pop'])
+
+
+def parse_mutations(lines, count):
+    # every command takes two lines: "name length" and the elements
+    lines = iter(lines)
+    for _ in range(count):
+        name = next(lines).split()[0]
+        if name not in MUTATIONS:
+            raise ValueError('unknown command: ' + name)
+        yield name, set(map(int, next(lines).split()))
+
+
+def parse_element_commands(lines, count):
+    # every command takes one line: "name" or "name element"
+    for line in islice(lines, count):
+        command = line.split()
+        if command[0] not in ELEMENT_COMMANDS:
+            raise ValueError('unknown command: ' + command[0])
+        if (len(command) == 1) != (command[0] == 'pop'):
+            raise ValueError('wrong arguments: ' + line.strip())
+        yield command[0], int(command[1]) if len(command) > 1 else None
+
+
+def make_table(s):
+    # whitelisted commands, every one runs a whole run of operands
+    update = s.update
+    remove = s.remove
+    pop = s.pop
+
+    def remove_all(elements):
+        for element in elements:
+            remove(element)
+
+    def pop_all(elements):
+        for _ in elements:
+            pop()
+
+    return {
+        'update': lambda sets: update(*sets),
+        'intersection_update': lambda sets: s.intersection_update(*sets),
+        'difference_update': lambda sets: s.difference_update(*sets),
+        'symmetric_difference_update':
+            lambda sets: s.symmetric_difference_update(reduce(xor, sets)),
+        'add': update,
+        'discard': s.difference_update,
+        'remove': remove_all,
+        'pop': pop_all,
+    }
+
+
+def execute(s, commands):
+    # runs the (name, operand) commands on the set s in place
+    table = make_table(s)
+    for name, run in groupby(commands, itemgetter(0)):
+        table[name]([operand for _, operand in run])
+    return s
@@ -0,0 +1,73 @@
+from __future__ import print_function
+
+import random
+import sys
+import timeit
+
+from set_commands import (ELEMENT_COMMANDS, MUTATIONS, execute,
+                          parse_element_commands, parse_mutations)
+
+SIZES = [10**5, 10**6]
+SET_SIZE = 1000
+
+
+def mutation_lines(count, rand):
+    names = sorted(MUTATIONS)
+    lines = []
+    for _ in range(count):
+        elements = rand.sample(range(SET_SIZE * 2), rand.randint(1, 10))
+        lines.append('%s %d\n' % (rand.choice(names), len(elements)))
+        lines.append(' '.join(map(str, elements)) + '\n')
+    return lines
+
+
+def element_lines(count, rand):
+    # remove and pop only when they cannot fail
+    names = sorted(ELEMENT_COMMANDS - set(['remove', 'pop']))
+    lines = []
+    for _ in range(count):
+        name = rand.choice(names)
+        lines.append('%s %d\n' % (name, rand.randint(0, SET_SIZE * 2)))
+    return lines
+
+
+def eval_mutations(A, lines):
+    # the previous eval based loop, for comparison
+    for i in range(0, len(lines), 2):
+        command = lines[i].split()[0]
+        B = set(map(int, lines[i + 1].split()))
+        eval('A.'+command+'(B)')
+    return A
+
+
+def eval_element_commands(s, lines):
+    # the previous eval based loop, for comparison
+    for line in lines:
+        command_list = line.split()
+        if len(command_list) > 1:
+            command_str = 's'+'.'+command_list[0]+'('+command_list[1]+')'
+        else:
+            command_str = 's'+'.'+command_list[0]+'()'
+        eval(command_str)
+    return s
+
+
+def measure(name, function, count):
+    seconds = timeit.timeit(function, number=1)
+    print('%-40s %10.2f s %12.0f ops/s' % (name, seconds, count / seconds))
+
+
+if __name__ == '__main__':
+    for size in [int(arg) for arg in sys.argv[1:]] or SIZES:
+        rand = random.Random(size)
+        A = set(range(SET_SIZE))
+        print('%d commands' % size)
+        lines = mutation_lines(size, rand)
+        measure('mutations, eval', lambda: eval_mutations(set(A), lines), size)
+        measure('mutations, execute', lambda: execute(
+            set(A), parse_mutations(lines, size)), size)
+        lines = element_lines(size, rand)
+        measure('discard/add, eval', lambda: eval_element_commands(
+            set(A), lines), size)
+        measure('discard/add, execute', lambda: execute(
+            set(A), parse_element_commands(lines, size)), size)
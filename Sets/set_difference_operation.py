@@ -1,10 +1,9 @@
-def inp():
-    input_list = map(int,raw_input().split())
-    if  len(input_list) > 1:
-        return input_list
-    else:
-        return input_list[0]
+import sys
 
-n, set1, m, set2 = inp(), set(inp()), inp(), set(inp())
+from int_set import IntSet
 
-print(len(set1.difference(set2)))
\ No newline at end of file
+lines = iter(sys.stdin.readline, '')
+n, set1, m, set2 = (next(lines), IntSet.from_string(next(lines)),
+                    next(lines), IntSet.from_string(next(lines)))
+
+print(set1.difference_count(set2))
@@ -1,13 +1,12 @@
-n = input()
-s = set(map(int, raw_input().split()))
-N = input()
-
-for i in range (N):
-    command_list = raw_input().split()
-    if len(command_list) > 1:
-        command_str = 's'+'.'+command_list[0]+'('+command_list[1]+')'
-    else:
-        command_str = 's'+'.'+command_list[0]+'()'
-    eval(command_str)
-  
-print(sum(s))
\ No newline at end of file
+import sys
+
+from set_commands import execute, parse_element_commands
+
+lines = iter(sys.stdin.readline, '')
+n = next(lines)
+s = set(map(int, next(lines).split()))
+N = int(next(lines))
+
+execute(s, parse_element_commands(lines, N))
+
+print(sum(s))
@@ -1,7 +1,12 @@
-n = input()
-eng_subscribe_set = set(map(int, raw_input().split()))
-m = input()
-french_subscribe_set = set(map(int, raw_input().split()))
+import sys
 
+from int_set import IntSet
 
-print (len(eng_subscribe_set&french_subscribe_set))
\ No newline at end of file
+lines = iter(sys.stdin.readline, '')
+n = next(lines)
+eng_subscribe_set = IntSet.from_string(next(lines))
+m = next(lines)
+french_subscribe_set = IntSet.from_string(next(lines))
+
+
+print (eng_subscribe_set.intersection_count(french_subscribe_set))
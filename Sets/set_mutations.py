@@ -1,8 +1,10 @@
-n, A, number_of_commands = input(), set(map(int, raw_input().split())), input()
+import sys
 
-for i in range(number_of_commands):
-	command = raw_input().split()[0]
-	B = set(map(int, raw_input().split()))
-	eval('A.'+command+'(B)')
+from set_commands import execute, parse_mutations
 
-print(sum(A))
\ No newline at end of file
+lines = iter(sys.stdin.readline, '')
+n, A, number_of_commands = next(lines), set(map(int, next(lines).split())), int(next(lines))
+
+execute(A, parse_mutations(lines, number_of_commands))
+
+print(sum(A))
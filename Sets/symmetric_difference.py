@@ -1,11 +1,12 @@
-def inp():
-    return map(int, raw_input().split())
+import sys
+
+from int_set import IntSet
 
 if __name__ == '__main__':
-    m = inp()
-    M = set(inp())
-    n = inp()
-    N = set(inp())
+    lines = iter(sys.stdin.readline, '')
+    m = next(lines)
+    M = IntSet.from_string(next(lines))
+    n = next(lines)
+    N = IntSet.from_string(next(lines))
 
-    for i in sorted((M^N)):
-    	print i
+    sys.stdout.writelines('%d\n' % i for i in M ^ N)
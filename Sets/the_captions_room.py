@@ -1,3 +1,44 @@
-K, rooms_arr = input(), map(int, raw_input().split())
+from functools import reduce
+from operator import xor
+try:
+    from itertools import imap as map
+except ImportError:
+    pass
 
-print(((sum(set(rooms_arr))*K) - sum(rooms_arr))/(K-1))
\ No newline at end of file
+from int_stream import numpy, stdin_reader
+
+def find_captain(chunks, K):
+    # one pass with O(1) memory: every family room is there K times, so
+    # for even K they cancel out in xor, for odd K every bit of the
+    # captain's room is the count of this bit modulo K
+    if K % 2 == 0:
+        return reduce(lambda captain, numbers: reduce(xor, numbers, captain),
+                      chunks, 0)
+    counts = []
+    for numbers in chunks:
+        bits = max(numbers).bit_length()
+        counts.extend([0] * (bits - len(counts)))
+        for bit in range(bits):
+            counts[bit] += sum(map((1 << bit).__and__, numbers)) >> bit
+    return sum((count % K) << bit for bit, count in enumerate(counts))
+
+def find_captain_numpy(chunks, K):
+    # the same with numpy arrays of the numbers
+    if K % 2 == 0:
+        captain = numpy.int64(0)
+        for numbers in chunks:
+            captain ^= numpy.bitwise_xor.reduce(numbers)
+        return int(captain)
+    counts = [0] * 63
+    for numbers in chunks:
+        for bit in range(int(numbers.max()).bit_length()):
+            counts[bit] += int(numpy.count_nonzero(numbers & (1 << bit)))
+    return sum((count % K) << bit for bit, count in enumerate(counts))
+
+if __name__ == '__main__':
+    reader = stdin_reader()
+    K = reader.read_ints()[0]
+    if numpy is None:
+        print(find_captain(reader.iter_int_chunks(), K))
+    else:
+        print(find_captain_numpy(reader.iter_array_chunks(), K))